@@ -0,0 +1,69 @@
+import asyncio
+from typing import Optional
+
+from config.config import ANKI_CARD_CONCURRENCY
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CLANKI_SERVER = "clanki"
+
+
+def _result_error(result) -> Optional[str]:
+    """The error text of an MCP tool result, or None when the call succeeded."""
+    if not getattr(result, "isError", False):
+        return None
+    return " ".join(getattr(block, "text", "") for block in result.content).strip() or "unknown error"
+
+
+def make_create_deck_with_cards(client, server_name : str = CLANKI_SERVER):
+    """
+    Composite tool that creates an Anki deck and all of its cards in a single
+    tool call, instead of one `create-card` round trip through the model per
+    word. The calls go to the clanki MCP server over one session, with up to
+    ANKI_CARD_CONCURRENCY cards in flight at once.
+    """
+    from langchain_core.tools import StructuredTool
+
+    async def create_deck_with_cards(deck_name : str,
+                                     translations : list[dict],
+                                     tags : Optional[list[str]] = None) -> dict:
+        """
+        Create an Anki deck and add one card per translation to it, in one call.
+
+        :param deck_name: Name of the deck to create, e.g. `Spanish::Easy`.
+        :param translations: The `translations` list returned by `translate_words`:
+            [{"source": "<original_word>", "target": "<translated_word>"}, ...].
+            The source word goes on the front of the card and the translation on the back.
+        :param tags: Optional tags added to every card.
+        :return: {"deck": <deck_name>, "created": <number of cards>, "failed": [{"source": ..., "error": ...}]}
+        """
+        # One card per source word; a repeated word would only be rejected by Anki.
+        cards = list({t["source"]: t for t in translations if t.get("source")}.values())
+
+        semaphore = asyncio.Semaphore(ANKI_CARD_CONCURRENCY)
+
+        async with client.session(server_name) as session:
+            error = _result_error(await session.call_tool("create-deck", {"name": deck_name}))
+            if error is not None:
+                return {"deck": deck_name, "created": 0, "failed": [{"source": None, "error": error}]}
+
+            async def create_card(card : dict):
+                arguments = {"deckName": deck_name, "front": card["source"], "back": card.get("target", "")}
+                if tags:
+                    arguments["tags"] = tags
+
+                async with semaphore:
+                    try:
+                        return _result_error(await session.call_tool("create-card", arguments))
+                    except Exception as e:
+                        return str(e)
+
+            errors = await asyncio.gather(*(create_card(card) for card in cards))
+
+        failed = [{"source": card["source"], "error": error} for card, error in zip(cards, errors) if error is not None]
+        logger.info(f"Deck {deck_name}: {len(cards) - len(failed)} cards created, {len(failed)} failed")
+
+        return {"deck": deck_name, "created": len(cards) - len(failed), "failed": failed}
+
+    return StructuredTool.from_function(coroutine = create_deck_with_cards, name = "create_deck_with_cards")
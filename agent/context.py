@@ -0,0 +1,89 @@
+import json
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from config.config import CONTEXT_TOKEN_BUDGET, CONTEXT_TOOL_RESULT_CHARS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lists longer than this in the arguments of an answered tool call are cut to their first items.
+MAX_ARG_ITEMS = 3
+
+
+def count_tokens(messages : list) -> int:
+    """Approximate token count (about 4 characters per token), without a tokenizer."""
+    return count_tokens_approximately(messages)
+
+
+def _truncate_result(message : ToolMessage, max_chars : int) -> ToolMessage:
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content, ensure_ascii = False)
+    if len(content) <= max_chars:
+        return message
+
+    if max_chars <= 0:
+        text = f"[{message.name} result omitted: {len(content)} characters]"
+    else:
+        text = f"{content[:max_chars]} ... [{len(content) - max_chars} characters truncated]"
+    return message.model_copy(update = {"content": text})
+
+
+def _shrink_args(value):
+    if isinstance(value, dict):
+        return {k: _shrink_args(v) for k, v in value.items()}
+    if isinstance(value, list) and len(value) > MAX_ARG_ITEMS:
+        return [_shrink_args(v) for v in value[:MAX_ARG_ITEMS]] + [f"... {len(value) - MAX_ARG_ITEMS} more"]
+    return value
+
+
+def _shrink_tool_calls(message : AIMessage) -> AIMessage:
+    tool_calls = [{**call, "args": _shrink_args(call["args"])} for call in message.tool_calls]
+    if tool_calls == message.tool_calls:
+        return message
+    # The raw provider payload repeats the arguments; drop it so only the short version is sent.
+    additional_kwargs = {k: v for k, v in message.additional_kwargs.items() if k != "tool_calls"}
+    return message.model_copy(update = {"tool_calls": tool_calls, "additional_kwargs": additional_kwargs})
+
+
+def compact_messages(messages : list,
+                     budget : int = CONTEXT_TOKEN_BUDGET,
+                     max_result_chars : int = CONTEXT_TOOL_RESULT_CHARS) -> tuple:
+    """
+    Shrink the messages sent to the model to about `budget` tokens.
+
+    Only what the model has already answered is compacted: tool results and
+    tool call arguments followed by a later AI message. Results the model has
+    not seen yet, the system prompt and the user messages are sent whole, and
+    no message is removed, so every tool call keeps its result.
+
+    1. Answered tool results longer than `max_result_chars` are truncated.
+    2. While over budget, oldest first, answered tool results are replaced by
+       a one-line note and long lists in answered tool call arguments (e.g. the
+       translations passed to create_deck_with_cards) are cut to a few items.
+
+    Returns `(messages, tokens)`; the state itself is never modified.
+    """
+    last_ai = max((i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default = -1)
+    answered = [i for i, m in enumerate(messages[:last_ai])
+                if isinstance(m, ToolMessage) or (isinstance(m, AIMessage) and m.tool_calls)]
+
+    compacted = list(messages)
+    for i in answered:
+        if isinstance(compacted[i], ToolMessage):
+            compacted[i] = _truncate_result(compacted[i], max_result_chars)
+
+    tokens = count_tokens(compacted)
+    for i in answered:
+        if tokens <= budget:
+            break
+        if isinstance(compacted[i], ToolMessage):
+            compacted[i] = _truncate_result(compacted[i], 0)
+        else:
+            compacted[i] = _shrink_tool_calls(compacted[i])
+        tokens = count_tokens(compacted)
+
+    if tokens > budget:
+        logger.warning(f"Context is {tokens} tokens after compaction, over the {budget} token budget")
+
+    return compacted, tokens
@@ -0,0 +1,180 @@
+import re
+import uuid
+
+from config.models_list import SPACY_MODELS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+LANGUAGES = {name.lower(): name for name in SPACY_MODELS}
+
+DIFFICULTY_SYNONYMS = {
+    "beginner": "beginner", "beginners": "beginner", "easy": "beginner", "easier": "beginner",
+    "simple": "beginner", "basic": "beginner", "elementary": "beginner",
+    "intermediate": "intermediate", "medium": "intermediate", "moderate": "intermediate",
+    "advanced": "advanced", "hard": "advanced", "harder": "advanced", "difficult": "advanced",
+    "challenging": "advanced", "expert": "advanced"
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "hundred": 100
+}
+
+# Words that carry no meaning for the request. The fast path answers only when
+# every word is one of these, a number, a language or a difficulty; anything
+# else (decks, topics, letters, parts of speech, follow-ups) goes to the LLM.
+FILLER_WORDS = {
+    "a", "an", "the", "some", "me", "us", "i", "we", "you", "please", "can", "could", "would",
+    "will", "want", "need", "like", "get", "give", "show", "list", "find", "pick", "fetch",
+    "generate", "provide", "retrieve", "return", "random", "randomly", "word", "words", "of",
+    "in", "from", "and", "then", "them", "it", "their", "with", "for", "level", "difficulty",
+    "language", "translate", "translated", "translating", "translation", "translations",
+    "to", "into"
+}
+
+MAX_WORDS = 500
+
+TOKEN_PATTERN = re.compile(r"[a-zA-Z]+|\d+|::")
+# The target language is the one right after the first "to" / "into" following "translate".
+TARGET_PATTERN = re.compile(r"\btranslat\w*\b.*?\b(?:to|into)\s+([a-zA-Z]+)", re.IGNORECASE)
+
+
+def parse_intent(prompt : str):
+    """
+    Parse a simple word request ("Get 10 easy words in Spanish", "translate
+    fifteen hard German words into English") without the LLM.
+
+    Returns a dict with `source_language`, `number_of_words`, `word_difficulty`
+    and `target_language` (the last two may be None), or None whenever the
+    prompt is not unambiguously one of these requests.
+    """
+    tokens = TOKEN_PATTERN.findall(prompt)
+    words = [t.lower() for t in tokens]
+
+    if "::" in tokens or not ({"word", "words"} & set(words)):
+        return None
+
+    known = FILLER_WORDS | LANGUAGES.keys() | DIFFICULTY_SYNONYMS.keys() | NUMBER_WORDS.keys()
+    if any(not w.isdigit() and w not in known for w in words):
+        return None
+
+    numbers = [int(w) if w.isdigit() else NUMBER_WORDS[w] for w in words if w.isdigit() or w in NUMBER_WORDS]
+    if len(numbers) != 1 or not 0 < numbers[0] <= MAX_WORDS:
+        return None
+
+    difficulties = {DIFFICULTY_SYNONYMS[w] for w in words if w in DIFFICULTY_SYNONYMS}
+    if len(difficulties) > 1:
+        return None
+
+    languages = [LANGUAGES[w] for w in words if w in LANGUAGES]
+
+    target_language = None
+    if any(w.startswith("translat") for w in words):
+        match = TARGET_PATTERN.search(prompt)
+        if not match or match.group(1).lower() not in LANGUAGES:
+            return None
+        target_language = LANGUAGES[match.group(1).lower()]
+        languages.remove(target_language)
+
+    if len(set(languages)) != 1 or languages[0] == target_language:
+        return None
+
+    return {
+        "source_language": languages[0],
+        "number_of_words": numbers[0],
+        "word_difficulty": difficulties.pop() if difficulties else None,
+        "target_language": target_language
+    }
+
+
+def format_answer(intent : dict, words : list, translations : list = None) -> str:
+    level = f"{intent['word_difficulty']} " if intent["word_difficulty"] else ""
+    header = f"Here are {len(words)} {level}{intent['source_language']} words"
+
+    if translations is None:
+        return f"{header}:\n" + "\n".join(f"{i}. {w}" for i, w in enumerate(words, 1))
+
+    return f"{header} with their {intent['target_language']} translations:\n" + "\n".join(
+        f"{i}. {t['source']} - {t['target']}" for i, t in enumerate(translations, 1)
+    )
+
+
+def make_intent_parser(tools : list):
+    """
+    Graph node that answers prompts `parse_intent` understands by calling the
+    word and translation tools directly, without an LLM round trip. Sessions
+    get `get_n_unseen_words`, so words are not repeated across requests. It fills
+    the AgentState fields and appends the tool calls, tool results and a
+    final answer to the messages. Anything else is left to the assistant.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+    tools_by_name = {t.name: t for t in tools}
+
+    async def call(name : str, args : dict, messages : list, state : dict = None):
+        call_id = f"fast-{uuid.uuid4().hex[:12]}"
+        messages.append(AIMessage(content = "", tool_calls = [{"name": name, "args": args, "id": call_id}]))
+        # Injected arguments are not part of the recorded call, as with ToolNode.
+        injected = {"state": state} if state is not None else {}
+        result = await tools_by_name[name].ainvoke({**args, **injected})
+        messages.append(ToolMessage(content = str(result), name = name, tool_call_id = call_id))
+        return result
+
+    async def intent_parser(state : dict):
+        last = state["messages"][-1] if state["messages"] else None
+        if not isinstance(last, HumanMessage) or not isinstance(last.content, str):
+            return {}
+
+        intent = parse_intent(last.content)
+        if intent is None:
+            return {}
+
+        language = intent["source_language"]
+        n = intent["number_of_words"]
+        messages = []
+
+        try:
+            if state.get("session_id"):
+                # Same behaviour as the LLM path for sessions: never repeat a word.
+                words = await call("get_n_unseen_words",
+                                   {"language": language, "n": n, "difficulty_level": intent["word_difficulty"]},
+                                   messages, state)
+            elif intent["word_difficulty"]:
+                words = await call("get_n_random_words_by_difficulty_level",
+                                   {"language": language, "difficulty_level": intent["word_difficulty"], "n": n},
+                                   messages)
+            else:
+                words = await call("get_n_random_words", {"language": language, "n": n}, messages)
+
+            translations = None
+            if intent["target_language"]:
+                result = await call("translate_words",
+                                    {"random_words": words, "source_language": language,
+                                     "target_language": intent["target_language"]},
+                                    messages)
+                translations = result["translations"]
+
+        except Exception as e:
+            # e.g. no word list for the language or too few words: let the LLM handle it.
+            logger.info(f"Fast path failed for {intent}, falling back to the assistant - {e}")
+            return {}
+
+        messages.append(AIMessage(content = format_answer(intent, words, translations)))
+        logger.info(f"Answered without the LLM: {intent}")
+
+        return {"messages": messages, **intent}
+
+    return intent_parser
+
+
+def route_after_intent_parser(state : dict) -> str:
+    """END when the fast path answered (the last message is its final answer), else the assistant."""
+    from langchain_core.messages import AIMessage
+    from langgraph.graph import END
+
+    last = state["messages"][-1]
+    return END if isinstance(last, AIMessage) and not last.tool_calls else "assistant"
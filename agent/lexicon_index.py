@@ -0,0 +1,53 @@
+import os
+import threading
+
+from config.paths_config import DATA_DIR, LEXICON_DIR
+
+
+class LexiconIndex:
+    """
+    Process-wide, lazily loaded pretranslated lexicons, one per language pair.
+
+    Like `WordListIndex`, a lexicon is loaded on first use and reloaded when
+    its file changes; pairs without a lexicon simply return no translations.
+    """
+
+    def __init__(self, data_dir : str = DATA_DIR):
+        self.data_dir = data_dir
+        self._lexicons = {}
+        self._lock = threading.Lock()
+
+
+    def get(self, source_language : str, target_language : str):
+        """The lexicon for the pair, or None when none was built."""
+        # Same layout as src.lexicon.lexicon_path, which is only imported once a lexicon exists.
+        path = os.path.join(self.data_dir, source_language, LEXICON_DIR, f"{target_language.strip().lower()}.npz")
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        source = (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        key = path
+        entry = self._lexicons.get(key)
+
+        if entry is not None and entry[0] == source:
+            return entry[1]
+
+        with self._lock:
+            entry = self._lexicons.get(key)
+            if entry is None or entry[0] != source:
+                from src.lexicon import load_lexicon
+
+                entry = (source, load_lexicon(path))
+                self._lexicons[key] = entry
+
+        return entry[1]
+
+
+    def get_many(self, source_language : str, target_language : str, words : list) -> dict:
+        lexicon = self.get(source_language, target_language)
+        return lexicon.get_many(words) if lexicon is not None else {}
+
+
+lexicon_index = LexiconIndex()
@@ -0,0 +1,175 @@
+import os
+import random
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialised
+    fcntl = None
+
+from config.paths_config import SESSIONS_DIR
+
+
+class SeenWords:
+    """
+    Bitset over a language's word indices marking the words a session has
+    already received. One bit per word, so even 500k words take ~60 KB.
+
+    The bitset belongs to one version of the word list; it is reset when the
+    word list is rebuilt, since indices may then point to other words.
+    """
+
+    def __init__(self, size : int, version : str, bits : bytearray = None):
+        self.size = size
+        self.version = version
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+        # Byte offsets changed since the bitset was last saved.
+        self.dirty = set()
+        self.persisted = False
+
+
+    def is_seen(self, index : int) -> bool:
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+
+    def mark(self, index : int):
+        self.bits[index >> 3] |= 1 << (index & 7)
+        self.dirty.add(index >> 3)
+
+
+    def sample_unseen(self, n : int, start : int, end : int) -> list:
+        """
+        Draw `n` distinct unseen indices from [start, end) and mark them seen.
+
+        Rejection sampling costs O(n) while most of the range is unseen; once
+        it stops making progress the remaining unseen indices are listed
+        explicitly, so a nearly exhausted range still terminates.
+        """
+        chosen = set()
+        attempts = 4 * n + 32
+
+        while len(chosen) < n and attempts > 0 and end > start:
+            index = random.randrange(start, end)
+            if not self.is_seen(index) and index not in chosen:
+                chosen.add(index)
+            attempts -= 1
+
+        if len(chosen) < n:
+            remaining = [i for i in range(start, end) if not self.is_seen(i) and i not in chosen]
+            missing = n - len(chosen)
+            if len(remaining) < missing:
+                raise ValueError(
+                    f"Only {len(chosen) + len(remaining)} unseen words left, {n} requested."
+                )
+            chosen.update(random.sample(remaining, missing))
+
+        for index in chosen:
+            self.mark(index)
+
+        return list(chosen)
+
+
+class SeenWordsStore:
+    """
+    Local persistence of `SeenWords` bitsets, one file per session and language:
+    `sessions/<sha1(session_id)>/<language>.bits`. Each file starts with the
+    word-list version on its own line, followed by the raw bits.
+
+    Several API workers can serve the same session, so nothing is cached in
+    the process: every call re-reads the bitset (at most ~60 KB) and rewrites only
+    the bytes that changed, holding an exclusive lock on `<language>.lock`
+    (`fcntl.flock`, where available) from the read to the write. Words handed
+    out by one worker are therefore never handed out again by another.
+    """
+
+    def __init__(self, directory : str = SESSIONS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+
+    def _path(self, session_id : str, language : str) -> str:
+        session_key = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, session_key, f"{language}.bits")
+
+
+    @contextmanager
+    def _locked(self, session_id : str, language : str):
+        """Serialise access to one session's bitset across threads and processes."""
+        lock_path = self._path(session_id, language)[:-len(".bits")] + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok = True)
+
+        with self._lock, open(lock_path, "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+    def load(self, session_id : str, language : str, size : int, version : str) -> SeenWords:
+        """The session's bitset as currently on disk; call it while holding `_locked`."""
+        path = self._path(session_id, language)
+
+        try:
+            with open(path, "rb") as f:
+                stored_version = f.readline().decode("utf-8").rstrip("\n")
+                bits = bytearray(f.read())
+        except FileNotFoundError:
+            return SeenWords(size, version)
+
+        if stored_version != version or len(bits) != (size + 7) // 8:
+            return SeenWords(size, version)
+
+        seen = SeenWords(size, version, bits)
+        seen.persisted = True
+        return seen
+
+
+    def save(self, session_id : str, language : str, seen : SeenWords):
+        path = self._path(session_id, language)
+        header = seen.version.encode("utf-8") + b"\n"
+
+        if seen.persisted and os.path.exists(path):
+            with open(path, "r+b") as f:
+                for offset in sorted(seen.dirty):
+                    f.seek(len(header) + offset)
+                    f.write(seen.bits[offset:offset + 1])
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(seen.bits)
+            os.replace(tmp_path, path)
+            seen.persisted = True
+
+        seen.dirty.clear()
+
+
+    def mark_seen(self, session_id : str, language : str, words, indices):
+        """Record words drawn some other way (e.g. by frequency) as received by `session_id`."""
+        with self._locked(session_id, language):
+            seen = self.load(session_id, language, len(words), words.version)
+            for index in indices:
+                seen.mark(index)
+            self.save(session_id, language, seen)
+
+
+    def sample_unseen(self, session_id : str, language : str, words, n : int,
+                      difficulty_level : str = None) -> list:
+        """Sample `n` words from `words` that `session_id` has not received yet."""
+        start, end = words.index_range(difficulty_level)
+
+        with self._locked(session_id, language):
+            seen = self.load(session_id, language, len(words), words.version)
+            indices = seen.sample_unseen(n, start, end)
+            self.save(session_id, language, seen)
+
+        return words.words(indices)
+
+
+seen_words_store = SeenWordsStore()
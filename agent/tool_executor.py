@@ -0,0 +1,47 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import TOOL_THREAD_POOL_SIZE
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool for the blocking part of async tool calls, created on first use."""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers = TOOL_THREAD_POOL_SIZE,
+                                               thread_name_prefix = "agent-tool")
+
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function (file reads, NumPy/SQLite work) in the bounded tool
+    pool so it never stalls the event loop, and at most TOOL_THREAD_POOL_SIZE
+    such calls run at once.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def blocking_tool(func):
+    """
+    Like `@tool`, but the tool also gets a coroutine that runs `func` through
+    `run_blocking`. `ToolNode` uses the coroutine when the graph runs with
+    `ainvoke`, and `func` directly otherwise.
+    """
+    from langchain_core.tools import StructuredTool
+
+    @functools.wraps(func)
+    async def coroutine(*args, **kwargs):
+        return await run_blocking(func, *args, **kwargs)
+
+    return StructuredTool.from_function(func = func, coroutine = coroutine, name = func.__name__)
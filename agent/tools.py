@@ -1,50 +1,82 @@
 import os
 import re
-import json
-import random
+import asyncio
+from typing import Annotated, Optional
 
-from langchain_core.tools import tool
-from langchain_ollama import ChatOllama
+from langchain_core.tools import StructuredTool
 from langchain_core.messages import HumanMessage
+from langgraph.prebuilt import InjectedState
 
-translation_model = ChatOllama(
-    model="llama3.2:3b",
-    temperature=0.7
-)
+from agent.word_index import word_index
+from agent.seen_words import seen_words_store
+from agent.translation_memory import translation_memory
+from agent.lexicon_index import lexicon_index
+from agent.tool_executor import blocking_tool, run_blocking
+from src.apkg import build_apkg
+from src.translators import build_translation_prompt, parse_translations, TranslationStreamParser, match_translations
+from config.paths_config import DECKS_DIR
+from config.config import TRANSLATION_CHUNK_SIZE, TRANSLATION_CONCURRENCY, TRANSLATION_MAX_RETRIES
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_translation_model = None
+
+def get_translation_model():
+    """The Ollama translation model, created on first use so importing the tools stays cheap."""
+    global _translation_model
+
+    if _translation_model is None:
+        from langchain_ollama import ChatOllama
+
+        _translation_model = ChatOllama(
+            model="llama3.2:3b",
+            temperature=0.7
+        )
+
+    return _translation_model
+
+def _sample_for_session(language: str, n: int, state: Optional[dict], difficulty_level: Optional[str] = None) -> list:
+    """
+        Random words for the session in `state`: words it has received before are
+        skipped and the new ones are remembered, whichever tool draws them.
+        Without a session there is nothing to remember words against.
+    """
+    words = word_index.get(language)
+    session_id = (state or {}).get("session_id")
 
-@tool
+    if not session_id:
+        return words.sample(n, difficulty_level)
+
+    return seen_words_store.sample_unseen(session_id, language, words, n, difficulty_level)
+
+@blocking_tool
 def get_n_random_words(language: str,
-                       n: int, ) -> list:
+                       n: int,
+                       state: Annotated[dict, InjectedState] = None) -> list:
     """
     Selects a specified number of random words from a language-specific word list.
 
-    The function reads a JSON file containing words for the specified language from
-    a predefined directory. It then selects `n` random words from the file and
-    returns them in a list.
+    The word list for the specified language is loaded once from a predefined
+    directory and kept in memory (it is reloaded when the file changes). `n`
+    random words are then selected from it and returned in a list.
 
     :param language: A string representing the language for which to fetch the word list.
     :param n: An integer specifying the number of random words to retrieve.
     :return: A list containing `n` randomly selected words.
     """
-    path = os.path.join("data", f"{language}", "word-list-cleaned.json")
-
-    with open(path) as f:
-        word_list = json.load(f)
-
-    random_word_dict = {k: word_list[k] for k in random.sample(list(word_list.keys()), n)}
-    random_words = [item["word"] for item in random_word_dict.values()]
-
-    return random_words
+    return _sample_for_session(language, n, state)
 
-@tool
+@blocking_tool
 def get_n_random_words_by_difficulty_level(language: str,
                                            difficulty_level: str,
-                                           n: int
+                                           n: int,
+                                           state: Annotated[dict, InjectedState] = None
                                            ) -> list:
     """
     Retrieves a specified number of random words filtered by a given difficulty level
-    from a word list corresponding to a specific language. The function reads the
-    word list from a JSON file located in the directory `data/{language}/word-list-cleaned.json`.
+    from a word list corresponding to a specific language. The word list comes from
+    `data/{language}/word-list-cleaned.json` and is indexed by difficulty in memory.
 
     :param language: The language of the word list to be used.
     :type language: str
@@ -57,23 +89,139 @@ def get_n_random_words_by_difficulty_level(language: str,
     :return: A list containing `n` random words filtered by the specified difficulty level.
     :rtype: list
     """
-    path = os.path.join("data", f"{language}", "word-list-cleaned.json")
+    return _sample_for_session(language, n, state, difficulty_level)
+
+@blocking_tool
+def get_n_common_words(language: str,
+                       n: int,
+                       min_zipf: Optional[float] = None,
+                       max_zipf: Optional[float] = None,
+                       state: Annotated[dict, InjectedState] = None
+                       ) -> list:
+    """
+    Retrieves `n` distinct random words where more frequent words are more likely to
+    be picked (each word's chance grows with the square root of how often it is used,
+    so everyday words come up often without "the" or "and" taking every slot). Use
+    this when the user asks for common, useful or everyday words.
+
+    Frequencies are on the Zipf scale: about 7 for the most common words ("the"),
+    5 for everyday words, 3 for words seen about once per million words and 1 for
+    very rare words. `min_zipf` / `max_zipf` optionally limit the words to that range.
+
+    :param language: The language of the word list to be used.
+    :type language: str
+    :param n: The number of words to retrieve.
+    :type n: int
+    :param min_zipf: Optional lowest Zipf frequency (inclusive).
+    :type min_zipf: float
+    :param max_zipf: Optional highest Zipf frequency (inclusive).
+    :type max_zipf: float
+    :return: A list containing `n` frequency-weighted random words.
+    :rtype: list
+    """
+    words = word_index.get(language)
+    indices = words.weighted_indices(n, min_zipf, max_zipf)
+
+    # Frequent words may come back, but the session remembers them so
+    # get_n_unseen_words does not hand them out again.
+    session_id = (state or {}).get("session_id")
+    if session_id:
+        seen_words_store.mark_seen(session_id, language, words, indices)
+
+    return words.words(indices)
+
+@blocking_tool
+def get_n_unseen_words(language: str,
+                       n: int,
+                       state: Annotated[dict, InjectedState],
+                       difficulty_level: Optional[str] = None
+                       ) -> list:
+    """
+    Retrieves `n` random words that the current user has not been given before,
+    optionally filtered by difficulty level. Use this when the user builds several
+    decks or asks for new / more / different words, so that words do not repeat.
+
+    :param language: The language of the word list to be used.
+    :type language: str
+    :param n: The number of random words to retrieve.
+    :type n: int
+    :param difficulty_level: Optional difficulty level. The only valid values are
+        "beginner", "intermediate" and "advanced".
+    :type difficulty_level: str
+    :return: A list containing `n` words the user has not received yet.
+    :rtype: list
+    """
+    return _sample_for_session(language, n, state, difficulty_level)
+
+def _chunks(words: list[str]) -> list[list[str]]:
+    return [words[i:i + TRANSLATION_CHUNK_SIZE] for i in range(0, len(words), TRANSLATION_CHUNK_SIZE)]
 
-    with open(path) as f:
-        word_list = json.load(f)
+def _translate_with_model(words: list[str],
+                          source_language: str,
+                          target_language: str) -> dict:
+    """Translate `words` chunk by chunk, retrying chunks whose response cannot be parsed."""
+    translated = {}
 
-    words_filtered_by_difficulty = {k: v for k, v in word_list.items() if v.get("word_difficulty") == difficulty_level}
+    for chunk in _chunks(words):
+        prompt = build_translation_prompt(chunk, source_language, target_language)
 
-    random_word_dict = {k: words_filtered_by_difficulty[k] for k in
-                        random.sample(list(words_filtered_by_difficulty.keys()), n)}
-    random_words = [item["word"] for item in random_word_dict.values()]
+        for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+            response = get_translation_model().invoke([HumanMessage(content=prompt)])
+            result = parse_translations(getattr(response, "content", str(response)).strip(), chunk)
+            if result is not None:
+                translated.update(result)
+                break
+            logger.warning(f"Unparsable translation of {len(chunk)} words (attempt {attempt + 1})")
 
-    return random_words
+    return translated
 
-@tool
-def translate_words(random_words: list[str],
-                    source_language: str,
-                    target_language: str) -> dict:
+async def _atranslate_with_model(words: list[str],
+                                 source_language: str,
+                                 target_language: str) -> dict:
+    """
+        Async counterpart of `_translate_with_model`: chunks are translated
+        concurrently with `ainvoke`, at most TRANSLATION_CONCURRENCY at a time,
+        and only the chunks that fail to parse are sent again.
+    """
+    semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+
+    async def translate_chunk(chunk: list[str]) -> dict:
+        prompt = build_translation_prompt(chunk, source_language, target_language)
+
+        for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+            async with semaphore:
+                response = await get_translation_model().ainvoke([HumanMessage(content=prompt)])
+            result = parse_translations(getattr(response, "content", str(response)).strip(), chunk)
+            if result is not None:
+                return result
+            logger.warning(f"Unparsable translation of {len(chunk)} words (attempt {attempt + 1})")
+
+        return {}
+
+    translated = {}
+    for result in await asyncio.gather(*(translate_chunk(chunk) for chunk in _chunks(words))):
+        translated.update(result)
+
+    return translated
+
+def _known_translations(random_words: list[str],
+                        source_language: str,
+                        target_language: str) -> dict:
+    """Translations available without the model: the pretranslated lexicon first, then the translation memory."""
+    known = lexicon_index.get_many(source_language, target_language, random_words)
+    rest = [w for w in random_words if w not in known]
+
+    if rest:
+        known.update(translation_memory.get_many(source_language, target_language, rest))
+
+    return known
+
+def _ordered_translations(random_words: list[str], known: dict) -> dict:
+    return {"translations": [{"source": w, "target": known.get(w, w)} for w in random_words]}
+
+def _translate_words(random_words: list[str],
+                     source_language: str,
+                     target_language: str) -> dict:
     """
         Translates a list of words from a source language to a target language using
         a language model. The method ensures output is in the expected JSON format,
@@ -86,55 +234,171 @@ def translate_words(random_words: list[str],
                 {"translations": [{"source": "<original>", "target": "<translated>"}, ...]}.
     """
 
-    prompt = (
-        f"You are a precise translation engine.\n"
-        f"Translate each of the following {len(random_words)} words from {source_language} to {target_language}.\n"
-        f"Return ONLY valid JSON with this exact structure:\n"
-        f'{{"translations": [{{"source": "<original>", "target": "<translated>"}}, ...]}}\n'
-        f"STRICT RULES:\n"
-        f"- Use double quotes only\n"
-        f"- No markdown\n"
-        f"- No explanations\n"
-        f"- No trailing commas\n"
-        f"Words: {json.dumps(random_words, ensure_ascii=False)}"
-    )
+    # Words found in the lexicon or translated before need no model call; only
+    # the rest go to the model, once each.
+    known = _known_translations(random_words, source_language, target_language)
+    missing = list(dict.fromkeys(w for w in random_words if w not in known))
 
-    response = translation_model.invoke([HumanMessage(content=prompt)])
-    text = getattr(response, "content", str(response)).strip()
+    if missing:
+        translated = _translate_with_model(missing, source_language, target_language)
+        translation_memory.put_many(source_language, target_language, translated)
+        known.update(translated)
 
-    def extract_and_fix_json(raw: str) -> dict:
-        match = re.search(r"\{.*\}", raw, re.DOTALL)
-        if not match:
-            return {}
+    logger.info(f"Translation memory : {translation_memory.stats()}")
 
-        json_text = match.group(0).strip()
+    return _ordered_translations(random_words, known)
 
-        # Fix common LLM JSON mistakes
-        json_text = json_text.replace("'", '"')  # single quotes -> double quotes
-        json_text = re.sub(r",\s*}", "}", json_text)  # trailing commas
-        json_text = re.sub(r",\s*]", "]", json_text)
+async def _atranslate_words(random_words: list[str],
+                            source_language: str,
+                            target_language: str) -> dict:
+    known = await run_blocking(_known_translations, random_words, source_language, target_language)
+    missing = list(dict.fromkeys(w for w in random_words if w not in known))
 
-        try:
-            return json.loads(json_text)
-        except json.JSONDecodeError:
-            return {}
+    if missing:
+        translated = await _atranslate_with_model(missing, source_language, target_language)
+        await run_blocking(translation_memory.put_many, source_language, target_language, translated)
+        known.update(translated)
+
+    logger.info(f"Translation memory : {translation_memory.stats()}")
+
+    return _ordered_translations(random_words, known)
+
+# Sync callers get the chunked sequential version; async callers (ToolNode inside
+# `graph.ainvoke`, i.e. the FastAPI app) get the concurrent one and never block
+# the event loop.
+translate_words = StructuredTool.from_function(
+    func=_translate_words,
+    coroutine=_atranslate_words,
+    name="translate_words"
+)
+
+@blocking_tool
+def export_anki_deck(deck_name: str,
+                     translations: list[dict],
+                     tags: Optional[list[str]] = None) -> dict:
+    """
+    Writes an Anki deck package (`.apkg`) with one card per translation, without
+    needing Anki to be running. The file is saved in the `decks` directory and can
+    be imported into Anki with File > Import.
+
+    :param deck_name: Name of the deck, e.g. `Spanish::Easy`.
+    :param translations: The `translations` list returned by `translate_words`:
+        [{"source": "<original_word>", "target": "<translated_word>"}, ...].
+    :param tags: Optional tags added to every card.
+    :return: {"path": <package path>, "deck": <deck_name>, "cards": <number of cards>, "media": 0}
+    """
+    file_name = re.sub(r"[^\w.-]+", "-", deck_name).strip("-") or "deck"
+    return build_apkg(os.path.join(DECKS_DIR, f"{file_name}.apkg"), deck_name, translations, tags)
+
+
+def _stream_chunk(chunk: list[str],
+                  source_language: str,
+                  target_language: str):
+    """Stream one chunk through the model, yielding (word, translation) pairs as they complete."""
+    pending = set(chunk)
+
+    for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+        prompt = build_translation_prompt([w for w in chunk if w in pending], source_language, target_language)
+        parser = TranslationStreamParser()
+
+        for message_chunk in get_translation_model().stream([HumanMessage(content=prompt)]):
+            yield from match_translations(parser.feed(message_chunk.content), pending)
+
+        if not pending:
+            return
+        logger.warning(f"{len(pending)} of {len(chunk)} words untranslated in stream (attempt {attempt + 1})")
+
+def stream_translations(random_words: list[str],
+                        source_language: str,
+                        target_language: str):
+    """
+        Streaming variant of `translate_words` for downstream consumers (card
+        creation, streaming APIs). Yields one {"source": ..., "target": ...}
+        dictionary per distinct word as soon as it is available: lexicon and
+        translation-memory hits first, then each model translation as soon as its
+        JSON object is complete. Words the model never translates come last,
+        with the word itself as target, as in `translate_words`.
+    """
+    words = list(dict.fromkeys(random_words))
+    known = _known_translations(words, source_language, target_language)
+
+    for w in words:
+        if w in known:
+            yield {"source": w, "target": known[w]}
+
+    missing = [w for w in words if w not in known]
+    translated = {}
 
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError:
-        parsed = extract_and_fix_json(text)
+        for chunk in _chunks(missing):
+            for word, target in _stream_chunk(chunk, source_language, target_language):
+                translated[word] = target
+                yield {"source": word, "target": target}
+    finally:
+        translation_memory.put_many(source_language, target_language, translated)
 
-    translations_list = parsed.get("translations", [])
+    for w in missing:
+        if w not in translated:
+            yield {"source": w, "target": w}
 
-    model_map = {
-        item.get("source", ""): item.get("target", "")
-        for item in translations_list
-        if isinstance(item, dict)
-    }
+async def astream_translations(random_words: list[str],
+                               source_language: str,
+                               target_language: str):
+    """
+        Async counterpart of `stream_translations`. Chunks are streamed
+        concurrently with `astream` (at most TRANSLATION_CONCURRENCY at once) and
+        translations are yielded in the order they complete.
+    """
+    words = list(dict.fromkeys(random_words))
+    known = await run_blocking(_known_translations, words, source_language, target_language)
+
+    for w in words:
+        if w in known:
+            yield {"source": w, "target": known[w]}
+
+    missing = [w for w in words if w not in known]
+    semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+    queue = asyncio.Queue()
+
+    async def stream_chunk(chunk: list[str]):
+        pending = set(chunk)
+        try:
+            for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+                prompt = build_translation_prompt([w for w in chunk if w in pending], source_language, target_language)
+                parser = TranslationStreamParser()
+
+                async with semaphore:
+                    async for message_chunk in get_translation_model().astream([HumanMessage(content=prompt)]):
+                        for pair in match_translations(parser.feed(message_chunk.content), pending):
+                            await queue.put(pair)
+
+                if not pending:
+                    return
+                logger.warning(f"{len(pending)} of {len(chunk)} words untranslated in stream (attempt {attempt + 1})")
+        finally:
+            # Marks the chunk as finished, also when it failed.
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(stream_chunk(chunk)) for chunk in _chunks(missing)]
+    translated = {}
+
+    try:
+        finished = 0
+        while finished < len(tasks):
+            pair = await queue.get()
+            if pair is None:
+                finished += 1
+                continue
+            translated[pair[0]] = pair[1]
+            yield {"source": pair[0], "target": pair[1]}
 
-    ordered_translations = [
-        {"source": w, "target": model_map.get(w, model_map.get(w.capitalize(), w))}
-        for w in random_words
-    ]
+        for task in tasks:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await run_blocking(translation_memory.put_many, source_language, target_language, translated)
 
-    return {"translations": ordered_translations}
\ No newline at end of file
+    for w in missing:
+        if w not in translated:
+            yield {"source": w, "target": w}
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from config.paths_config import TRANSLATION_MEMORY_PATH
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TranslationMemory:
+    """
+    Translations already produced by the model, keyed by
+    (source_language, target_language, word).
+
+    Lookups go to an in-memory LRU first and then to a local SQLite database
+    that survives restarts and is shared by all API workers (WAL mode). Only
+    words found in neither are sent to the model. `hits` and `misses` count
+    words, not calls.
+    """
+
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, path : str = TRANSLATION_MEMORY_PATH, max_cached : int = 50000):
+        self.path = path
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+
+    @staticmethod
+    def _key(source_language : str, target_language : str, word : str) -> tuple:
+        return source_language.strip().lower(), target_language.strip().lower(), word
+
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use so importing the tools never touches the disk.
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+
+            self._conn = sqlite3.connect(self.path, timeout = 30, check_same_thread = False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    PRIMARY KEY (source_language, target_language, word)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+
+        return self._conn
+
+
+    def _remember(self, key : tuple, translation : str):
+        self._cache[key] = translation
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last = False)
+
+
+    def get_many(self, source_language : str, target_language : str, words : list) -> dict:
+        """Return the known translations of `words` as a word -> translation dictionary."""
+        found = {}
+        missing = []
+
+        with self._lock:
+            for word in dict.fromkeys(words):
+                key = self._key(source_language, target_language, word)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    found[word] = self._cache[key]
+                else:
+                    missing.append(word)
+
+            try:
+                source, target, _ = self._key(source_language, target_language, "")
+                for start in range(0, len(missing), self.QUERY_CHUNK_SIZE):
+                    chunk = missing[start:start + self.QUERY_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._connection().execute(
+                        f"SELECT word, translation FROM translations "
+                        f"WHERE source_language = ? AND target_language = ? AND word IN ({placeholders})",
+                        [source, target, *chunk]
+                    )
+                    for word, translation in rows:
+                        found[word] = translation
+                        self._remember((source, target, word), translation)
+
+            except sqlite3.Error as e:
+                # The memory is only an optimisation; fall back to the model.
+                logger.error(f"Error while reading translation memory - {e}")
+
+            hits = sum(1 for word in words if word in found)
+            self.hits += hits
+            self.misses += len(words) - hits
+
+        return found
+
+
+    def put_many(self, source_language : str, target_language : str, translations : dict):
+        if not translations:
+            return
+
+        source, target, _ = self._key(source_language, target_language, "")
+
+        with self._lock:
+            for word, translation in translations.items():
+                self._remember((source, target, word), translation)
+
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO translations (source_language, target_language, word, translation) "
+                        "VALUES (?, ?, ?, ?)",
+                        ((source, target, word, translation) for word, translation in translations.items())
+                    )
+
+            except sqlite3.Error as e:
+                logger.error(f"Error while writing translation memory - {e}")
+
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "cached": len(self._cache)
+        }
+
+
+translation_memory = TranslationMemory()
@@ -0,0 +1,181 @@
+import os
+import json
+import random
+import threading
+
+from config.paths_config import DATA_DIR, CLEANED_WORD_LIST_FILE, WORD_STORE_DIR
+
+# Name of the file pointing at a word store's current build (src.word_store.CURRENT_FILE).
+# The word-store modules import NumPy, so they are only imported when a list is loaded.
+CURRENT_FILE = "CURRENT"
+
+
+class LanguageWords:
+    """
+    All words of one language held in memory, grouped by difficulty.
+
+    Words are kept in one list ordered by difficulty level so that, like in a
+    `WordStore`, every level is a contiguous index range. When Zipf
+    frequencies are available the list is ordered by descending frequency
+    instead (which also keeps the levels contiguous) and alias tables for
+    frequency-weighted sampling are built for the whole list and every level.
+    """
+
+    def __init__(self, words : list, difficulties : list, source : tuple, zipf = None):
+        import numpy as np
+        from src.alias_table import build_alias_table, zipf_weights, WeightedSampler
+
+        order = range(len(words))
+        if zipf is not None:
+            zipf = np.asarray(zipf, dtype = np.float32)
+            order = np.argsort(-zipf, kind = "stable").tolist()
+            zipf = zipf[order]
+
+        groups = {}
+        for i in order:
+            groups.setdefault(difficulties[i], []).append(words[i])
+
+        self.words_list = []
+        self.difficulty_ranges = {}
+        for difficulty, group in groups.items():
+            start = len(self.words_list)
+            self.words_list.extend(group)
+            self.difficulty_ranges[difficulty] = (start, len(self.words_list))
+
+        self.weighted_sampler = None
+        if zipf is not None:
+            tables = {
+                (start, end): build_alias_table(zipf_weights(zipf[start:end]))
+                for start, end in [(0, len(zipf)), *self.difficulty_ranges.values()]
+            }
+            self.weighted_sampler = WeightedSampler(zipf, tables)
+
+        # (path, inode, mtime_ns, size) of the file the words were loaded from.
+        self.source = source
+        self.version = f"{source[0]}:{source[2]}:{source[3]}:{'zipf' if zipf is not None else 'level'}"
+
+
+    def __len__(self) -> int:
+        return len(self.words_list)
+
+
+    def words(self, indices) -> list:
+        return [self.words_list[i] for i in indices]
+
+
+    def index_range(self, difficulty_level : str = None) -> tuple:
+        if difficulty_level is None:
+            return 0, len(self.words_list)
+        return self.difficulty_ranges.get(difficulty_level, (0, 0))
+
+
+    def sample(self, n : int, difficulty_level : str = None) -> list:
+        start, end = self.index_range(difficulty_level)
+        return self.words(random.sample(range(start, end), n))
+
+
+    def weighted_indices(self, n : int, min_zipf : float = None, max_zipf : float = None) -> list:
+        if self.weighted_sampler is None:
+            raise ValueError(
+                f"{self.source[0]} has no Zipf frequencies; re-run the data pipeline to export them."
+            )
+
+        start, end = self.weighted_sampler.zipf_range(min_zipf, max_zipf)
+        return self.weighted_sampler.sample(n, start, end)
+
+
+    def weighted_sample(self, n : int, min_zipf : float = None, max_zipf : float = None) -> list:
+        return self.words(self.weighted_indices(n, min_zipf, max_zipf))
+
+
+class WordListIndex:
+    """
+    Process-wide, lazily loaded index of the cleaned word lists.
+
+    A language is loaded on first use and kept in memory; later calls only
+    `stat` the file and reload it when it changed. Sources are tried in order:
+    the memory-mapped word store (nothing is parsed and all workers share its
+    pages), then the JSON export.
+    """
+
+    def __init__(self, data_dir : str = DATA_DIR):
+        self.data_dir = data_dir
+        self._languages = {}
+        self._lock = threading.Lock()
+
+
+    def _locate(self, language : str) -> tuple:
+        candidates = (
+            os.path.join(WORD_STORE_DIR, CURRENT_FILE),
+            CLEANED_WORD_LIST_FILE
+        )
+
+        for file_name in candidates:
+            path = os.path.join(self.data_dir, language, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            return path, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+        raise FileNotFoundError(
+            f"No word list for '{language}' in {os.path.join(self.data_dir, language)}"
+        )
+
+
+    @staticmethod
+    def _load(source : tuple):
+        path = source[0]
+
+        if os.path.basename(path) == CURRENT_FILE:
+            from src.word_store import WordStore
+
+            store = WordStore.open(os.path.dirname(path))
+            store.source = source
+            store.version = os.path.basename(store.build_dir)
+            return store
+
+        with open(path, encoding = "utf-8") as f:
+            word_list = json.load(f)
+
+        entries = list(word_list.values())
+        # Word lists exported before Zipf frequencies were kept have no such field.
+        has_zipf = all("zipf_freq_lemma" in item for item in entries)
+        return LanguageWords(
+            [item["word"] for item in entries],
+            [item.get("word_difficulty") for item in entries],
+            source,
+            [item["zipf_freq_lemma"] for item in entries] if has_zipf else None
+        )
+
+
+    def get(self, language : str):
+        """
+        Return a `WordStore` or `LanguageWords` for `language`. Both expose
+        `__len__`, `index_range`, `words`, `sample`, `weighted_indices`, `weighted_sample` and a
+        `version` string that changes whenever word indices may have changed.
+        """
+        source = self._locate(language)
+        entry = self._languages.get(language)
+
+        if entry is not None and entry.source == source:
+            return entry
+
+        with self._lock:
+            entry = self._languages.get(language)
+            if entry is None or entry.source != source:
+                entry = self._load(source)
+                self._languages[language] = entry
+
+        return entry
+
+
+    def sample(self, language : str, n : int, difficulty_level : str = None) -> list:
+        return self.get(language).sample(n, difficulty_level)
+
+
+    def weighted_sample(self, language : str, n : int, min_zipf : float = None, max_zipf : float = None) -> list:
+        return self.get(language).weighted_sample(n, min_zipf, max_zipf)
+
+
+word_index = WordListIndex()
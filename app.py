@@ -1,41 +1,76 @@
+import json
+import asyncio
 import uvicorn
+from typing import Optional
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from assistant_groq import build_graph
-from langchain_core.messages import HumanMessage
-
 app = FastAPI(title="Lumen Language Learning Agent API")
 
+# The agent (LangChain, LangGraph, Groq, the MCP client) is imported and built
+# on the first /chat request, so the server starts serving right away.
 react_graph = None
+graph_lock = asyncio.Lock()
 
 
 class PromptRequest(BaseModel):
     prompt: str
+    # Identifies the learner so repeated requests do not return the same words.
+    session_id: Optional[str] = None
+
 
+class TranslateRequest(BaseModel):
+    words: list[str]
+    source_language: str
+    target_language: str
 
-@app.on_event("startup")
-async def startup_event():
+
+async def get_graph():
     global react_graph
-    react_graph = await build_graph()
+
+    if react_graph is None:
+        async with graph_lock:
+            if react_graph is None:
+                from assistant_groq import build_graph
+
+                react_graph = await build_graph()
+
+    return react_graph
 
 
 @app.post("/chat")
 async def chat(req: PromptRequest):
-    global react_graph
+    from langchain_core.messages import HumanMessage
+
+    graph = await get_graph()
 
     messages = [HumanMessage(content=req.prompt)]
 
-    result = await react_graph.ainvoke({
+    result = await graph.ainvoke({
         "messages": messages,
         "source_language": None,
         "number_of_words": None,
         "word_difficulty": None,
-        "target_language": None
+        "target_language": None,
+        "session_id": req.session_id
     })
 
     return {"response": result["messages"][-1].content}
 
 
+@app.post("/translate/stream")
+async def translate_stream(req: TranslateRequest):
+    """Translations as newline-delimited JSON, each line sent as soon as it is parsed."""
+
+    from agent.tools import astream_translations
+
+    async def lines():
+        async for item in astream_translations(req.words, req.source_language, req.target_language):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 if __name__ == "__main__":
     uvicorn.run("app:app", host="127.0.0.1", port=8000, reload=True)
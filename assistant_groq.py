@@ -1,20 +1,24 @@
 import asyncio
 from typing import TypedDict, Annotated, Optional
 
-from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage
-from langchain_groq import ChatGroq
+from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage, AIMessage
 from langgraph.graph.message import add_messages
-from langgraph.graph import StateGraph, START
+from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
-from langchain_mcp_adapters.client import MultiServerMCPClient
 
-from config.config import GROQ_API_KEY
+from config.config import GROQ_API_KEY, PARALLEL_TOOL_CALLS
 from config.paths_config import CLANKI_JS
 from agent.tools import (
     get_n_random_words,
     get_n_random_words_by_difficulty_level,
-    translate_words
+    get_n_common_words,
+    get_n_unseen_words,
+    translate_words,
+    export_anki_deck
 )
+from agent.context import compact_messages, count_tokens
+from agent.anki_tools import make_create_deck_with_cards, CLANKI_SERVER
+from agent.intent_parser import make_intent_parser, route_after_intent_parser
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -26,20 +30,28 @@ class AgentState(TypedDict):
     number_of_words: Optional[int]
     word_difficulty: Optional[str]
     target_language: Optional[str]
+    session_id: Optional[str]
 
 
 # Tools
 local_tools = [
     get_n_random_words,
     get_n_random_words_by_difficulty_level,
-    translate_words
+    get_n_common_words,
+    get_n_unseen_words,
+    translate_words,
+    export_anki_deck
 ]
 
 
 async def setup_tools():
+    # Imported here: the MCP client and the Groq SDK (below) are only needed
+    # once a graph is built, not to import this module.
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+
     client = MultiServerMCPClient(
         {
-            "clanki": {
+            CLANKI_SERVER: {
                 "command": "node",
                 "args": [CLANKI_JS],
                 "transport": "stdio"
@@ -47,64 +59,18 @@ async def setup_tools():
         }
     )
     mcp_tools = await client.get_tools()
-    return [*local_tools, *mcp_tools]
+    return [*local_tools, make_create_deck_with_cards(client), *mcp_tools]
 
 
 # Assistant
-def assistant(state : AgentState):
-
-    textual_description_of_tools = """
-        def get_n_random_words(language: str,
-                        n: int, ) -> list:
-        Get a specified number of random words from a word list file for a given language.
-
-        This function fetches a language-specific word list from a JSON file and
-        selects a random subset of words from this list, returning it as a list.
-
-        Args:
-            word_list: A dictionary of words.
-            n: The desired number of words.
-
-        Returns:
-            list: A word list as a list.
-
-        def get_n_random_words_by_difficulty_level(language: str,
-                                            difficulty_level: str,
-                                            n: int
-                                            ) -> list:
-        Retrieves a specified number of random words from a word list filtered by a given
-        difficulty level within a specific language. This function expects the word list to
-        be stored in a JSON file, organized by language, in the 'data' directory.
-
-        :param language: The language of the word list to search within.
-        :type language: str
-        :param difficulty_level: The difficulty level of the words. This must be one of `beginner`,
-            `intermediate` or `advanced`.
-        :type difficulty_level: str
-        :param n: The number of random words to retrieve.
-        :type n: int
-        :return: A list of randomly selected words matching the specified difficulty
-            level.
-        :rtype: list
-
-        def translate_words(random_words: list, source_language: str, target_language: str) -> dict:
-        Translate a list of words from a source language to a target language using a translation
-        model. The returned translations are provided in the same order as the input words.
-
-        :param random_words: List of words to be translated.
-            The words must be provided as strings in the source language.
-        :param source_language: Source language of the words in random_words.
-        :param target_language: Target language into which the words should be translated.
-        :return: A dictionary containing the translations:
-            {
-                "translations": [
-                    {"source": "<original_word>", "target": "<translated_word>"},
-                    ...
-                ]
-            }
+def build_system_message() -> SystemMessage:
+    """
+    The system prompt. It does not depend on the state, so it is built once per graph.
+    The tools are not described here: `bind_tools` already sends their names,
+    arguments and docstrings with every request.
     """
-    
-    sys_msg = SystemMessage(content=f"""
+
+    sys_msg = SystemMessage(content="""
             You are a helpful language learning assistant. 
             STRICT RULES:
             - Never write tool calls manually.
@@ -121,11 +87,14 @@ def assistant(state : AgentState):
             4. Adding the words to an Anki deck using MCP tools
 
             IMPORTANT:
-            - If user requests Anki deck creation, you MUST call create-deck first.
-            - Then call create-card for each word.
+            - If user requests Anki deck creation with translated words, call create_deck_with_cards
+              ONCE with the deck name and the full translations list. Never call create-card for each word.
+            - If the user asks for a deck file, an .apkg or an offline deck, call export_anki_deck
+              ONCE instead, with the same arguments.
+            - Only for other decks, call create-deck first and then create-card for each word.
             - Respond only with final output after tool execution.
 
-            You can carry out actions using the following tools: {textual_description_of_tools}. 
+            You can carry out actions using the tools you are given; their descriptions explain when to use each one.
 
             The user is going to give you a command.
 
@@ -134,7 +103,7 @@ def assistant(state : AgentState):
             2. How many words they want.
             3. Whether they want words of a specific difficulty, part-of-speech, or just random words.
             4. Whether they want these words translated into a target language.
-            5. Whether they want to add these words to an Anki deck. Make sure the `create-deck` tool is called before `create-card`.
+            5. Whether they want to add these words to an Anki deck. Use `create_deck_with_cards` for the whole deck.
 
             Here are some example workflows:
             input: Get 20 random words in Spanish.
@@ -151,7 +120,7 @@ def assistant(state : AgentState):
             target language: English
             number of words: 20
             word difficulty: beginner
-            tools workflow: get_n_random_words_by_difficulty_level -> translate_words -> mcp_tools::create_deck -> mcp_tools::create_card
+            tools workflow: get_n_random_words_by_difficulty_level -> translate_words -> create_deck_with_cards
 
             input: Get 10 random words in German, and create a new Anki deck with them called German::Words
             source language: German
@@ -159,35 +128,69 @@ def assistant(state : AgentState):
             tools workflow: get_n_random_words -> mcp_tools::create_deck -> mcp_tools::create_card
         """)
 
-    # LLM
-    tools = assistant.tools if hasattr(assistant, "tools") else []
+    return sys_msg
+
+
+def build_llm(tools : list):
+    """The chat model with the tools bound, built once per graph so every step reuses its HTTP client."""
+    from langchain_groq import ChatGroq
+
     llm = ChatGroq(
         groq_api_key = GROQ_API_KEY,
         model_name = "llama-3.3-70b-versatile"
         )
-    llm_with_tools = llm.bind_tools(tools, parallel_tool_calls = False)
+    return llm.bind_tools(tools, parallel_tool_calls = PARALLEL_TOOL_CALLS)
+
 
-    return {
-        "messages" : [llm_with_tools.invoke([sys_msg] + state["messages"])],
-        "source_language": state["source_language"],
-        "number_of_words": state["number_of_words"],
-        "word_difficulty": state["word_difficulty"],
-        "target_language": state["target_language"]
-    }
+def make_assistant(llm_with_tools, sys_msg : SystemMessage):
+    """
+    The assistant node; each step only sends the prebuilt prompt and the messages,
+    compacted to CONTEXT_TOKEN_BUDGET, and logs the tokens used by the turn.
+    """
+
+    async def assistant(state : AgentState):
+        messages = [sys_msg] + state["messages"]
+        compacted, tokens = compact_messages(messages)
+
+        response = await llm_with_tools.ainvoke(compacted)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        logger.info(
+            f"Turn {sum(isinstance(m, AIMessage) for m in messages) + 1}: ~{tokens} tokens sent "
+            f"(~{count_tokens(messages)} before compaction), "
+            f"model reported {usage.get('input_tokens', '?')} input / {usage.get('output_tokens', '?')} output tokens"
+        )
+
+        return {
+            "messages" : [response],
+            "source_language": state["source_language"],
+            "number_of_words": state["number_of_words"],
+            "word_difficulty": state["word_difficulty"],
+            "target_language": state["target_language"]
+        }
+
+    return assistant
 
 
 async def build_graph():
     """Build the state graph with properly initialized tools."""
 
     tools = await setup_tools()
-    assistant.tools = tools
+    assistant = make_assistant(build_llm(tools), build_system_message())
 
     builder = StateGraph(AgentState)
 
+    # Simple word requests are answered by the intent parser without the LLM.
+    builder.add_node("intent_parser", make_intent_parser(local_tools))
     builder.add_node("assistant", assistant)
     builder.add_node("tools", ToolNode(tools))
 
-    builder.add_edge(START, "assistant")
+    builder.add_edge(START, "intent_parser")
+    builder.add_conditional_edges(
+        "intent_parser",
+        route_after_intent_parser,
+        ["assistant", END]
+        )
     builder.add_conditional_edges(
         "assistant",
         tools_condition
@@ -211,7 +214,8 @@ async def main():
         "source_language" : None,
         "number_of_words" : None,
         "word_difficulty": None,
-        "target_language": None
+        "target_language": None,
+        "session_id": None
     })
 
     logger.info(f"Final messages : {result['messages'][-1].content}")
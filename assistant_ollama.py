@@ -3,7 +3,6 @@ import asyncio
 from typing import TypedDict, Annotated, Optional
 
 from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage
-from langchain_ollama import ChatOllama
 from langgraph.graph.message import add_messages
 from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import ToolNode, tools_condition
@@ -11,7 +10,8 @@ from langgraph.prebuilt import ToolNode, tools_condition
 
 from agent.tools import (
     get_n_random_words,
-    get_n_random_words_by_difficulty_level
+    get_n_random_words_by_difficulty_level,
+    get_n_common_words
 )
 from utils.logger import get_logger
 
@@ -28,7 +28,8 @@ class AgentState(TypedDict):
 # Tools
 local_tools = [
     get_n_random_words,
-    get_n_random_words_by_difficulty_level
+    get_n_random_words_by_difficulty_level,
+    get_n_common_words
 ]
 
 
@@ -37,7 +38,8 @@ async def setup_tools():
 
 
 # Assistant
-def assistant(state : AgentState):
+def build_system_message() -> SystemMessage:
+    """The system prompt. It does not depend on the state, so it is built once per graph."""
 
     textual_description_of_tools = """
         def get_n_random_words(language: str,
@@ -74,9 +76,16 @@ def assistant(state : AgentState):
         :type n: int
         :return: A list containing `n` random words filtered by the specified difficulty level.
         :rtype: list
+
+
+        def get_n_common_words(language: str, n: int, min_zipf: float = None, max_zipf: float = None) -> list:
+        Retrieves `n` random words where more frequent words are more likely to be picked.
+        Use it when the user asks for common, useful or everyday words. Frequencies are on
+        the Zipf scale (about 7 for "the", 5 for everyday words, 3 for rare words);
+        `min_zipf` / `max_zipf` optionally limit the words to that range.
     """
     
-    sys_msg = SystemMessage(content = f"""
+    return SystemMessage(content = f"""
         You are a helpful language learning assistant. You can carry out actions using the following tools: {textual_description_of_tools}. 
 
         The user is going to give you a command.
@@ -97,27 +106,37 @@ def assistant(state : AgentState):
         word difficulty: advanced                  
     """)
 
-    # LLM
-    tools = assistant.tools if hasattr(assistant, "tools") else []
+
+def build_llm(tools : list):
+    """The chat model with the tools bound, built once per graph so every step reuses its HTTP client."""
+    from langchain_ollama import ChatOllama
+
     llm = ChatOllama(
         model = "qwen3:8b",
         temperature = 0.7
         )
-    llm_with_tools = llm.bind_tools(tools, tool_choice="any")
+    return llm.bind_tools(tools, tool_choice="any")
+
+
+def make_assistant(llm_with_tools, sys_msg : SystemMessage):
+    """The assistant node; each step only sends the prebuilt prompt and the messages."""
+
+    async def assistant(state : AgentState):
+        return {
+            "messages" : [await llm_with_tools.ainvoke([sys_msg] + state["messages"])],
+            "source_language": state["source_language"],
+            "number_of_words": state["number_of_words"],
+            "word_difficulty": state["word_difficulty"]
+        }
 
-    return {
-        "messages" : [llm_with_tools.invoke([sys_msg] + state["messages"])],
-        "source_language": state["source_language"],
-        "number_of_words": state["number_of_words"],
-        "word_difficulty": state["word_difficulty"]
-    }
+    return assistant
 
 
 async def build_graph():
     """Build the state graph with properly initialized tools."""
 
     tools = await setup_tools()
-    assistant.tools = tools
+    assistant = make_assistant(build_llm(tools), build_system_message())
 
     builder = StateGraph(AgentState)
 
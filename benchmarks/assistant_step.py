@@ -0,0 +1,148 @@
+"""
+Per-step overhead of the assistant node, before and after building the bound
+model and the system message once per graph.
+
+"before" repeats what every step used to do: create the chat client, call
+`bind_tools` and format the system prompt. "after" only builds the message
+list. Both then call a local stand-in for the Ollama API over HTTP, so the
+"after" runs also show the reused connection pool. Groq is measured on
+construction alone, since it would need the network.
+
+    python -m benchmarks.assistant_step --steps 12 --repeat 5
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OllamaStandIn(BaseHTTPRequestHandler):
+    """Answers /api/chat with a single final message, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        OllamaStandIn.connections.add(self.client_address)
+
+        body = json.dumps({
+            "model": "qwen3:8b",
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": "ok"},
+            "done": True,
+            "done_reason": "stop"
+        }).encode("utf-8") + b"\n"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStandIn)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+    return server
+
+
+def per_step_ms(fn, steps : int, repeat : int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(steps):
+            fn()
+        timings.append((time.perf_counter() - start) / steps * 1000)
+    return statistics.median(timings)
+
+
+async def per_step_ms_async(fn, steps : int, repeat : int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(steps):
+            await fn()
+        timings.append((time.perf_counter() - start) / steps * 1000)
+    return statistics.median(timings)
+
+
+def bench_groq(steps : int, repeat : int) -> dict:
+    import assistant_groq
+    from langchain_core.messages import HumanMessage
+
+    # ChatGroq needs a key to be constructed; nothing is sent.
+    assistant_groq.GROQ_API_KEY = assistant_groq.GROQ_API_KEY or "benchmark"
+    tools = assistant_groq.local_tools
+    messages = [HumanMessage(content = "Get 10 easy words in Spanish")]
+
+    def before():
+        llm_with_tools = assistant_groq.build_llm(tools)
+        return llm_with_tools, [assistant_groq.build_system_message()] + messages
+
+    llm_with_tools, sys_msg = assistant_groq.build_llm(tools), assistant_groq.build_system_message()
+
+    def after():
+        return llm_with_tools, [sys_msg] + messages
+
+    return {
+        "groq_prepare_before": per_step_ms(before, steps, repeat),
+        "groq_prepare_after": per_step_ms(after, steps, repeat)
+    }
+
+
+async def bench_ollama(steps : int, repeat : int) -> dict:
+    import assistant_ollama
+    from langchain_core.messages import HumanMessage
+
+    tools = assistant_ollama.local_tools
+    messages = [HumanMessage(content = "Get 10 easy words in Spanish")]
+    results = {}
+
+    async def before():
+        llm_with_tools = assistant_ollama.build_llm(tools)
+        return await llm_with_tools.ainvoke([assistant_ollama.build_system_message()] + messages)
+
+    llm_with_tools, sys_msg = assistant_ollama.build_llm(tools), assistant_ollama.build_system_message()
+
+    async def after():
+        return await llm_with_tools.ainvoke([sys_msg] + messages)
+
+    for name, fn in (("before", before), ("after", after)):
+        OllamaStandIn.connections.clear()
+        results[f"ollama_step_{name}"] = await per_step_ms_async(fn, steps, repeat)
+        results[f"ollama_connections_{name}"] = len(OllamaStandIn.connections)
+
+    return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Per-step overhead of the assistant node.")
+    parser.add_argument("--steps", type = int, default = 12, help = "Graph steps per run (a 10-card run takes ~12).")
+    parser.add_argument("--repeat", type = int, default = 5, help = "Runs; the median per-step time is reported.")
+    args = parser.parse_args()
+
+    server = start_stand_in()
+    try:
+        results = bench_groq(args.steps, args.repeat)
+        results.update(asyncio.run(bench_ollama(args.steps, args.repeat)))
+    finally:
+        server.shutdown()
+
+    print(f"{'measurement':<28} {'value':>10}")
+    print("-" * 39)
+    for name, value in results.items():
+        if "connections" in name:
+            print(f"{name:<28} {value:>10}")
+        else:
+            print(f"{name:<28} {value:>10.3f} ms")
@@ -0,0 +1,254 @@
+"""
+Offline benchmark suite for src/data_processor.py and src/data_ingestion.py.
+
+Everything runs in a temporary directory without network access: word lists
+are synthetic, the spaCy model is a blank pipeline with a stand-in lemmatizer,
+and ingestion runs against a local git repository.
+
+    python -m benchmarks.data_processing --words 200000 --repeat 3
+    python -m benchmarks.data_processing --compare benchmarks/results/<older>.json
+
+Results are saved under benchmarks/results/ named after the current commit so
+two commits can be compared with --compare.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import string
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+import spacy
+from spacy.language import Language
+from wordfreq import top_n_list
+
+from src.data_processor import DataProcessor
+from src.data_ingestion import DataIngestion
+from src.run_manifest import RunManifest
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+LANGUAGE = "English"
+STAND_IN_MODEL = "en_benchmark_blank"
+
+
+@Language.component("benchmark_lemmatizer")
+def benchmark_lemmatizer(doc):
+    """Cheap stand-in for a real lemmatizer: lowercase and drop a plural 's'."""
+    for token in doc:
+        text = token.lower_
+        token.lemma_ = text[:-1] if len(text) > 3 and text.endswith("s") else text
+    return doc
+
+
+def build_stand_in_pipeline():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("benchmark_lemmatizer")
+    return nlp
+
+
+def generate_word_list(path : str, n_words : int, vocabulary : int = 20000, seed : int = 0):
+    """
+    Write a comma-separated word list of `n_words` tokens.
+
+    Most tokens come from the wordfreq vocabulary (so frequency lookups hit),
+    with some capitalised, punctuated and random out-of-vocabulary tokens.
+    """
+    rng = random.Random(seed)
+    words = top_n_list("en", vocabulary)
+
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "w", encoding = "utf-8") as f:
+        tokens = []
+        for _ in range(n_words):
+            roll = rng.random()
+            if roll < 0.1:
+                token = "".join(rng.choices(string.ascii_lowercase, k = rng.randint(4, 12)))
+            else:
+                token = rng.choice(words)
+                if roll < 0.2:
+                    token = token.capitalize()
+                elif roll < 0.25:
+                    token += rng.choice(".!?;")
+            tokens.append(token)
+        f.write(",".join(tokens))
+
+
+def make_processor(data_dir : str, cache_path : str = None, streaming : bool = False) -> DataProcessor:
+    processor = DataProcessor({LANGUAGE: "en_core_web_sm"}, data_dir,
+                              lemma_cache_path = cache_path, n_process = 1, streaming = streaming)
+    processor.nlp = build_stand_in_pipeline()
+    processor.lemma_model = STAND_IN_MODEL
+    processor.lemma_model_version = "0"
+    return processor
+
+
+def timed(fn, repeat : int) -> tuple:
+    """Run `fn` `repeat` times; return (median seconds, last result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def bench_processing(workdir : str, n_words : int, repeat : int) -> dict:
+    data_dir = os.path.join(workdir, "raw-word-list")
+    generate_word_list(os.path.join(data_dir, LANGUAGE, f"{LANGUAGE}.txt"), n_words)
+
+    processor = make_processor(data_dir)
+    results = {}
+
+    results["load_and_clean_word_list"], df = timed(
+        lambda: processor.load_and_clean_word_list(LANGUAGE), repeat)
+    results["add_lemma"], lemma_df = timed(
+        lambda: processor.add_lemma(df.copy()), repeat)
+    results["add_word_frequencies"], freq_df = timed(
+        lambda: processor.add_word_frequencies(lemma_df.copy(), LANGUAGE), repeat)
+    results["clean_up_and_export"], _ = timed(
+        lambda: processor.clean_up_and_export(freq_df.copy(), LANGUAGE), repeat)
+
+    def end_to_end(p : DataProcessor):
+        frame = p.load_and_clean_word_list(LANGUAGE)
+        frame = p.add_lemma(frame)
+        frame = p.add_word_frequencies(frame, LANGUAGE)
+        p.clean_up_and_export(frame, LANGUAGE)
+
+    results["end_to_end"], _ = timed(lambda: end_to_end(processor), repeat)
+
+    def streaming_end_to_end():
+        p = make_processor(data_dir, streaming = True)
+        p.clean_up_and_export(p.build_lemma_table_streaming(LANGUAGE), LANGUAGE)
+
+    results["end_to_end_streaming"], _ = timed(streaming_end_to_end, repeat)
+
+    # The lemma cache is measured cold (fresh database) and warm (second pass).
+    def cached_add_lemma():
+        cache_path = os.path.join(workdir, f"lemma-cache-{time.perf_counter_ns()}.sqlite3")
+        p = make_processor(data_dir, cache_path = cache_path)
+        cold_start = time.perf_counter()
+        p.add_lemma(df.copy())
+        cold = time.perf_counter() - cold_start
+        warm_start = time.perf_counter()
+        p.add_lemma(df.copy())
+        return cold, time.perf_counter() - warm_start
+
+    cache_timings = [cached_add_lemma() for _ in range(repeat)]
+    results["add_lemma_cache_cold"] = statistics.median(t[0] for t in cache_timings)
+    results["add_lemma_cache_warm"] = statistics.median(t[1] for t in cache_timings)
+
+    return results
+
+
+def git(repo : str, *args):
+    subprocess.run(["git", "-C", repo, "-c", "user.name=bench", "-c", "user.email=bench@localhost", *args],
+                   check = True, capture_output = True)
+
+
+def bench_ingestion(workdir : str, n_words : int, n_languages : int = 20) -> dict:
+    """Full clone vs. sparse incremental sync of a local repo where one language changed."""
+    source = os.path.join(workdir, "upstream")
+    os.makedirs(source)
+    subprocess.run(["git", "init", "-q", source], check = True)
+
+    languages = [f"Language{i:02d}" for i in range(n_languages)]
+    for language in languages:
+        generate_word_list(os.path.join(source, language, f"{language}.txt"), n_words // n_languages,
+                           seed = len(language))
+    git(source, "add", "-A")
+    git(source, "commit", "-q", "-m", "initial")
+
+    url = f"file://{os.path.abspath(source)}"
+    results = {}
+
+    def run(name : str, incremental : bool):
+        manifest = RunManifest(os.path.join(workdir, f"{name}-manifest.json"))
+        ingestion = DataIngestion(url, os.path.join(workdir, f"{name}-repo"), os.path.join(workdir, f"{name}-out"),
+                                  manifest = manifest, incremental = incremental, languages = languages)
+        start = time.perf_counter()
+        ingestion.run()
+        return time.perf_counter() - start
+
+    results["ingestion_full_initial"] = run("full", incremental = False)
+    results["ingestion_incremental_initial"] = run("incremental", incremental = True)
+
+    # One upstream language changes; both modes sync only its files.
+    generate_word_list(os.path.join(source, languages[0], f"{languages[0]}.txt"), n_words // n_languages, seed = 99)
+    git(source, "commit", "-q", "-am", "update")
+
+    results["ingestion_full_update"] = run("full", incremental = False)
+    results["ingestion_incremental_update"] = run("incremental", incremental = True)
+    results["ingestion_incremental_noop"] = run("incremental", incremental = True)
+
+    return results
+
+
+def current_commit() -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], check = True, capture_output = True, text = True)
+        return result.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def save_results(results : dict, params : dict) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok = True)
+    commit = current_commit()
+    path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}-{commit}.json")
+
+    with open(path, "w", encoding = "utf-8") as f:
+        json.dump({"commit": commit, "params": params, "python": sys.version.split()[0],
+                   "spacy": spacy.__version__, "seconds": results}, f, indent = 2)
+
+    return path
+
+
+def print_results(results : dict, baseline : dict = None):
+    header = f"{'benchmark':<32} {'seconds':>10}"
+    if baseline:
+        header += f" {'baseline':>10} {'change':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for name, seconds in results.items():
+        line = f"{name:<32} {seconds:>10.4f}"
+        if baseline and name in baseline:
+            change = (seconds - baseline[name]) / baseline[name] if baseline[name] else 0.0
+            line += f" {baseline[name]:>10.4f} {change:>+8.1%}"
+        print(line)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Offline benchmarks for the data-processing pipeline.")
+    parser.add_argument("--words", type = int, default = 100000, help = "Size of the synthetic word list.")
+    parser.add_argument("--repeat", type = int, default = 3, help = "Runs per benchmark; the median is reported.")
+    parser.add_argument("--skip-ingestion", action = "store_true")
+    parser.add_argument("--compare", default = None, help = "Earlier results file to compare against.")
+    parser.add_argument("--no-save", action = "store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix = "lumen-bench-")
+    try:
+        results = bench_processing(workdir, args.words, args.repeat)
+        if not args.skip_ingestion:
+            results.update(bench_ingestion(workdir, args.words))
+    finally:
+        shutil.rmtree(workdir, ignore_errors = True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding = "utf-8") as f:
+            baseline = json.load(f)["seconds"]
+
+    print_results(results, baseline)
+
+    if not args.no_save:
+        print(f"\nSaved to {save_results(results, {'words': args.words, 'repeat': args.repeat})}")
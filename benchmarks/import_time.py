@@ -0,0 +1,96 @@
+"""
+Import-time benchmark for the API and agent entry points.
+
+Each module is imported in a fresh interpreter with `python -X importtime`;
+the cumulative time of the module itself is compared with its budget in
+IMPORT_BUDGETS_MS. The exit status is 1 when any module is over budget, so
+the script can gate CI.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --top 15 --module app
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Budgets in milliseconds (median of --repeat runs on a warm disk cache).
+IMPORT_BUDGETS_MS = {
+    "app": 600,
+    "assistant_groq": 1500,
+    "assistant_ollama": 1500,
+    "pipeline.data_pipeline": 500
+}
+
+
+def import_times(module : str) -> dict:
+    """Cumulative import time in microseconds of every module imported by `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output = True, text = True, cwd = os.getcwd()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # A package can be listed again under its own submodules; keep the outer entry.
+        times[name.strip()] = max(times.get(name.strip(), 0), int(cumulative))
+
+    return times
+
+
+def run_benchmark(modules : list, repeat : int) -> dict:
+    results = {}
+
+    for module in modules:
+        runs = [import_times(module) for _ in range(repeat)]
+        total_ms = statistics.median(run[module] for run in runs) / 1000
+
+        # Heaviest dependencies of the last run, by cumulative time.
+        heaviest = sorted(
+            ((name, us / 1000) for name, us in runs[-1].items() if name != module),
+            key = lambda item: item[1], reverse = True
+        )
+
+        results[module] = {"ms": total_ms, "budget_ms": IMPORT_BUDGETS_MS.get(module), "heaviest": heaviest}
+
+    return results
+
+
+def print_results(results : dict, top : int):
+    header = f"{'module':<26} {'import ms':>10} {'budget ms':>10} {'status':>7}"
+    print(header)
+    print("-" * len(header))
+
+    for module, r in results.items():
+        budget = r["budget_ms"]
+        status = "-" if budget is None else ("ok" if r["ms"] <= budget else "OVER")
+        print(f"{module:<26} {r['ms']:>10.1f} {budget if budget is not None else '-':>10} {status:>7}")
+
+    if top:
+        for module, r in results.items():
+            print(f"\nHeaviest imports under {module}:")
+            for name, ms in r["heaviest"][:top]:
+                print(f"  {ms:>9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Measure import time against per-module budgets.")
+    parser.add_argument("--module", action = "append", default = None,
+                        help = "Module to measure (repeatable). Defaults to every module with a budget.")
+    parser.add_argument("--repeat", type = int, default = 3, help = "Runs per module; the median is reported.")
+    parser.add_argument("--top", type = int, default = 10, help = "Heaviest imports to list per module.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.module or list(IMPORT_BUDGETS_MS), args.repeat)
+    print_results(results, args.top)
+
+    over = [m for m, r in results.items() if r["budget_ms"] is not None and r["ms"] > r["budget_ms"]]
+    sys.exit(1 if over else 0)
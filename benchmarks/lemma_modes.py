@@ -0,0 +1,102 @@
+"""
+Compare lemmatization pipeline modes for one language.
+
+For every mode the benchmark reports model load time, lemmatization speed
+(words/sec) and how often its lemmas differ from the "full" pipeline, which
+is the reference. Use it to pick a per-language entry for LEMMA_MODES.
+
+    python -m benchmarks.lemma_modes --language German --sample 20000
+"""
+import time
+import json
+import random
+import argparse
+
+from src.data_processor import DataProcessor
+from src.lemma_pipeline import build_lemma_pipeline, LEMMA_MODES
+from config.paths_config import RAW_WORD_LIST_DIR
+from config.models_list import SPACY_MODELS
+
+
+def lemmatize(nlp, words : list, batch_size : int, n_process : int) -> list:
+    return [doc[0].lemma_ for doc in nlp.pipe(words, batch_size = batch_size, n_process = n_process)]
+
+
+def run_benchmark(language : str,
+                  modes : list,
+                  sample : int = 10000,
+                  batch_size : int = 1000,
+                  n_process : int = 1,
+                  seed : int = 0) -> list:
+    processor = DataProcessor(SPACY_MODELS, RAW_WORD_LIST_DIR, lemma_cache_path = None)
+    df = processor.load_and_clean_word_list(language)
+
+    words = df.loc[df["word"] != "", "word"].drop_duplicates().to_list()
+    if sample and len(words) > sample:
+        words = random.Random(seed).sample(words, sample)
+
+    model_name = SPACY_MODELS[language]
+    results = []
+    reference = None
+
+    # The reference always runs first so every other mode can be compared to it.
+    for mode in ["full"] + [m for m in modes if m != "full"]:
+        start = time.perf_counter()
+        nlp, _, _ = build_lemma_pipeline(model_name, mode)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lemmas = lemmatize(nlp, words, batch_size, n_process)
+        lemma_seconds = time.perf_counter() - start
+
+        if reference is None:
+            reference = lemmas
+
+        differing = sum(1 for a, b in zip(lemmas, reference) if a != b)
+
+        results.append({
+            "language": language,
+            "model": model_name,
+            "mode": mode,
+            "pipeline": list(nlp.pipe_names),
+            "words": len(words),
+            "load_seconds": round(load_seconds, 3),
+            "lemma_seconds": round(lemma_seconds, 3),
+            "words_per_second": round(len(words) / lemma_seconds, 1) if lemma_seconds else None,
+            "disagreement_rate": round(differing / len(words), 4) if words else 0.0
+        })
+
+        del nlp
+
+    return results
+
+
+def print_results(results : list):
+    header = f"{'mode':<8} {'words':>8} {'load s':>8} {'words/s':>10} {'differs':>8}  pipeline"
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        print(f"{r['mode']:<8} {r['words']:>8} {r['load_seconds']:>8.2f} "
+              f"{r['words_per_second'] or 0:>10.1f} {r['disagreement_rate']:>8.2%}  "
+              f"{', '.join(r['pipeline']) or '-'}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description = "Benchmark lemmatization modes against the full pipeline.")
+    parser.add_argument("--language", required = True, choices = sorted(SPACY_MODELS))
+    parser.add_argument("--modes", nargs = "+", default = ["lemma", "lookup"], choices = LEMMA_MODES)
+    parser.add_argument("--sample", type = int, default = 10000,
+                        help = "Number of unique words to lemmatize (0 for all).")
+    parser.add_argument("--batch-size", type = int, default = 1000)
+    parser.add_argument("--n-process", type = int, default = 1)
+    parser.add_argument("--output", default = None, help = "Optional path for a JSON copy of the results.")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.language, args.modes, args.sample, args.batch_size, args.n_process)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding = "utf-8") as f:
+            json.dump(results, f, indent = 2)
@@ -3,4 +3,75 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
\ No newline at end of file
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+
+# Parallel language processing
+# Rough resident memory (in GB) of one loaded spaCy model, used by the
+# scheduler in DataProcessor to decide how many languages can run at once.
+TRF_MODEL_MEMORY_GB = 3.0
+LG_MODEL_MEMORY_GB = 1.5
+
+PARALLEL_MAX_WORKERS = int(os.getenv("PARALLEL_MAX_WORKERS", os.cpu_count() or 1))
+PARALLEL_MEMORY_BUDGET_GB = float(os.getenv("PARALLEL_MEMORY_BUDGET_GB", 8))
+
+
+# Difficulty classification (Zipf frequency of the lemma)
+DIFFICULTY_BINS = [-float("inf"), 2.0, 4.0, float("inf")]
+DIFFICULTY_LABELS = ["advanced", "intermediate", "beginner"]
+
+
+# Lemmatization pipeline per language
+# "full"   : the whole model minus parser/ner/textcat (reference quality)
+# "lemma"  : only the model components the lemmatizer depends on
+# "lookup" : tokenizer + lookup-table lemmatizer (needs spacy-lookups-data)
+# Languages missing from LEMMA_MODES use DEFAULT_LEMMA_MODE.
+DEFAULT_LEMMA_MODE = os.getenv("DEFAULT_LEMMA_MODE", "full")
+LEMMA_MODES = {}
+
+# Processes used by nlp.pipe in sequential runs; parallel runs always use 1.
+LEMMA_N_PROCESS = int(os.getenv("LEMMA_N_PROCESS", 1))
+
+
+# Streaming word-list loading
+# Words per chunk handed to the lemmatizer, and bytes read from disk at a time.
+STREAM_CHUNK_WORDS = int(os.getenv("STREAM_CHUNK_WORDS", 50000))
+STREAM_READ_BYTES = 1 << 20
+
+
+# translate_words
+# Words per translation prompt, prompts in flight at once for the async tool,
+# and extra attempts for a chunk whose response cannot be parsed.
+TRANSLATION_CHUNK_SIZE = int(os.getenv("TRANSLATION_CHUNK_SIZE", 25))
+TRANSLATION_CONCURRENCY = int(os.getenv("TRANSLATION_CONCURRENCY", 4))
+TRANSLATION_MAX_RETRIES = int(os.getenv("TRANSLATION_MAX_RETRIES", 2))
+
+
+# Bilingual lexicon stage (pipeline/data_pipeline.py --lexicon)
+# Pairs as "Source:Target" separated by commas, e.g. "Spanish:English,German:English".
+LEXICON_LANGUAGE_PAIRS = [
+    tuple(pair.split(":", 1))
+    for pair in os.getenv("LEXICON_LANGUAGE_PAIRS", "").split(",")
+    if ":" in pair
+]
+LEXICON_TRANSLATOR = os.getenv("LEXICON_TRANSLATOR", "ollama")
+LEXICON_BATCH_SIZE = int(os.getenv("LEXICON_BATCH_SIZE", 50))
+
+
+# Async agent tools
+# Threads shared by all async tool calls for file reads and CPU-bound work.
+TOOL_THREAD_POOL_SIZE = int(os.getenv("TOOL_THREAD_POOL_SIZE", 4))
+
+
+# Anki deck building
+# Cards created at once by the create_deck_with_cards tool, and whether the
+# model may return several tool calls in one turn (ToolNode runs them concurrently).
+ANKI_CARD_CONCURRENCY = int(os.getenv("ANKI_CARD_CONCURRENCY", 8))
+PARALLEL_TOOL_CALLS = os.getenv("PARALLEL_TOOL_CALLS", "false").lower() in ("1", "true", "yes")
+
+
+# Context compaction in the assistant node
+# Approximate tokens sent to the model per turn, and characters kept of tool
+# results the model has already answered.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 4000))
+CONTEXT_TOOL_RESULT_CHARS = int(os.getenv("CONTEXT_TOOL_RESULT_CHARS", 500))
@@ -6,6 +6,31 @@ OUTPUT_DIR = "raw-word-list"
 
 
 RAW_WORD_LIST_DIR = "raw-word-list"
+# Cleaned word lists served by the agent tools: data/<language>/...
+DATA_DIR = "data"
+CLEANED_WORD_LIST_FILE = "word-list-cleaned.json"
+# Memory-mapped word store directory, shared read-only by every API worker.
+WORD_STORE_DIR = "word-store"
+
+# Pretranslated lexicons: <language>/lexicon/<target language>.npz
+LEXICON_DIR = "lexicon"
+
+# Records the inputs of the last successful run so unchanged languages are skipped.
+MANIFEST_PATH = "run-manifest.json"
+
+# Per-session bitsets of words already handed out by the agent tools.
+SESSIONS_DIR = "sessions"
+
+# Run reports and profiles written by the data pipeline.
+REPORTS_DIR = "reports"
+
+# word -> lemma cache shared by all runs, keyed by spaCy model and version.
+LEMMA_CACHE_PATH = os.path.join("cache", "lemma-cache.sqlite3")
+# (source language, target language, word) -> translation memory of translate_words.
+TRANSLATION_MEMORY_PATH = os.path.join("cache", "translation-memory.sqlite3")
+
+# Anki packages (.apkg) written by the export_anki_deck tool.
+DECKS_DIR = "decks"
 
 
 CLANKI_JS = "clanki/build/index.js"
\ No newline at end of file
@@ -1,36 +1,136 @@
+import argparse
+
 from src.data_ingestion import DataIngestion
 from src.data_processor import DataProcessor
+from src.run_manifest import RunManifest
+from src.lexicon import LexiconBuilder
+from src.translators import get_translator, TRANSLATORS
+from config.config import LEXICON_LANGUAGE_PAIRS, LEXICON_TRANSLATOR
 from config.paths_config import *
 from config.models_list import SPACY_MODELS
 from utils.logger import get_logger
+from utils.run_report import RunReport
 
 logger = get_logger(__name__)
 
 
 class DataPipeline:
 
-    def __init__(self):
-        pass
+    def __init__(self,
+                 parallel : bool = False,
+                 max_workers : int = None,
+                 memory_budget_gb : float = None,
+                 force : bool = False,
+                 incremental : bool = False,
+                 streaming : bool = False,
+                 profile_language : str = None,
+                 lexicon : bool = False,
+                 lexicon_pairs : list = None,
+                 translator : str = LEXICON_TRANSLATOR):
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.memory_budget_gb = memory_budget_gb
+        self.force = force
+        self.incremental = incremental
+        self.streaming = streaming
+        self.profile_language = profile_language
+        self.lexicon = lexicon
+        self.lexicon_pairs = lexicon_pairs if lexicon_pairs is not None else LEXICON_LANGUAGE_PAIRS
+        self.translator = translator
+        self.report = RunReport()
+        self.manifest = RunManifest(MANIFEST_PATH)
 
     def run_data_pipeline(self):
 
         STAGE_NAME = "Data Ingestion"
 
-        ingestion = DataIngestion(REPO_URL, REPO_DIR, OUTPUT_DIR)
-        ingestion.run()
+        ingestion = DataIngestion(REPO_URL, REPO_DIR, OUTPUT_DIR,
+                                  manifest = self.manifest, force = self.force,
+                                  incremental = self.incremental,
+                                  languages = list(SPACY_MODELS.keys()))
+        with self.report.stage("all", "ingestion"):
+            ingestion.run()
 
         logger.info(f"{STAGE_NAME} completed successfully.")
 
         STAGE_NAME = "Data Processing"
 
-        processor = DataProcessor(SPACY_MODELS, RAW_WORD_LIST_DIR)
-        processor.process_all_languages()
+        processor = DataProcessor(SPACY_MODELS, RAW_WORD_LIST_DIR,
+                                  manifest = self.manifest, streaming = self.streaming,
+                                  report = self.report, profile_language = self.profile_language)
+        failures = processor.process_all_languages(
+            parallel = self.parallel,
+            max_workers = self.max_workers,
+            memory_budget_gb = self.memory_budget_gb,
+            force = self.force
+        )
+
+        if failures:
+            for language, error in failures.items():
+                logger.error(f"{STAGE_NAME} failed for {language}: {error}")
+            logger.info(f"{STAGE_NAME} completed with {len(failures)} failed language(s).")
+        else:
+            logger.info(f"{STAGE_NAME} completed successfully.")
+
+        if self.lexicon:
+            STAGE_NAME = "Lexicon Precompute"
+
+            pairs = [pair for pair in self.lexicon_pairs if pair[0] not in failures]
+            builder = LexiconBuilder(RAW_WORD_LIST_DIR, get_translator(self.translator), report = self.report)
+            lexicon_failures = builder.run(pairs)
+
+            for pair, error in lexicon_failures.items():
+                logger.error(f"{STAGE_NAME} failed for {pair}: {error}")
+            logger.info(f"{STAGE_NAME} completed for {len(pairs) - len(lexicon_failures)} of {len(pairs)} pair(s).")
+
+        report_path = self.report.write(REPORTS_DIR)
+        summary = self.report.summary_table()
+        logger.info(f"Run report written to {report_path}\n{summary}")
+        print(summary)
+
+        return failures
 
-        logger.info(f"{STAGE_NAME} completed successfully.")
 
-    
 
 if __name__ == "__main__":
 
-    dataPipeline = DataPipeline()
-    dataPipeline.run_data_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description = "Build cleaned word lists for all languages.")
+    parser.add_argument("--parallel", action = "store_true",
+                        help = "Process each language in its own worker process.")
+    parser.add_argument("--max-workers", type = int, default = None,
+                        help = "Maximum number of languages processed at once (parallel mode).")
+    parser.add_argument("--memory-budget-gb", type = float, default = None,
+                        help = "Memory budget shared by all workers (parallel mode).")
+    parser.add_argument("--force", action = "store_true",
+                        help = "Re-copy and reprocess every language, ignoring the run manifest.")
+    parser.add_argument("--incremental", action = "store_true",
+                        help = "Sparse, shallow fetch of the processed languages; sync only changed files.")
+    parser.add_argument("--streaming", action = "store_true",
+                        help = "Stream each word list in chunks instead of loading it whole.")
+    parser.add_argument("--profile-language", default = None, choices = sorted(SPACY_MODELS),
+                        help = "Run cProfile while processing this language.")
+    parser.add_argument("--lexicon", action = "store_true",
+                        help = "Pretranslate the cleaned word lists for the configured language pairs.")
+    parser.add_argument("--lexicon-pairs", default = None,
+                        help = "Comma-separated Source:Target pairs, e.g. Spanish:English,German:English.")
+    parser.add_argument("--translator", default = LEXICON_TRANSLATOR, choices = sorted(TRANSLATORS),
+                        help = "Translator backend used by the lexicon stage.")
+    args = parser.parse_args()
+
+    lexicon_pairs = None
+    if args.lexicon_pairs:
+        lexicon_pairs = [tuple(pair.split(":", 1)) for pair in args.lexicon_pairs.split(",") if ":" in pair]
+
+    dataPipeline = DataPipeline(
+        parallel = args.parallel,
+        max_workers = args.max_workers,
+        memory_budget_gb = args.memory_budget_gb,
+        force = args.force,
+        incremental = args.incremental,
+        streaming = args.streaming,
+        profile_language = args.profile_language,
+        lexicon = args.lexicon,
+        lexicon_pairs = lexicon_pairs,
+        translator = args.translator
+    )
+    dataPipeline.run_data_pipeline()
@@ -0,0 +1,157 @@
+from itertools import islice
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Sampling weights are 10 ** (zipf / ZIPF_TEMPERATURE), i.e. frequency ** (1 / 2):
+# one Zipf step (10x more frequent) makes a word ~3.2x more likely rather than
+# 10x, so common words are favoured without function words taking every draw.
+ZIPF_TEMPERATURE = 2.0
+
+
+def build_alias_table(weights) -> tuple:
+    """
+    Build a Walker/Vose alias table for sampling indices proportionally to `weights`.
+
+    Returns `(prob, alias)`: to draw, pick a column `i` uniformly and keep it
+    with probability `prob[i]`, otherwise take `alias[i]`. Every draw is O(1).
+    All-zero weights give a uniform table.
+
+    The construction is Vose's, with the small columns filled in order and a
+    large column that drops below 1 topped up by the next large one. Which
+    large column fills which small one then follows from cumulative sums, so
+    the table is built with NumPy in O(n log n) instead of a Python loop.
+    """
+    weights = np.asarray(weights, dtype = np.float64)
+    n = len(weights)
+    total = weights.sum()
+
+    prob = np.ones(n, dtype = np.float64)
+    alias = np.arange(n, dtype = np.int32)
+    if n == 0 or total <= 0:
+        return prob, alias
+
+    scaled = weights * (n / total)
+    small = np.flatnonzero(scaled < 1.0)
+    large = np.flatnonzero(scaled >= 1.0)
+    if len(small) == 0 or len(large) == 0:
+        # Every column is 1.0 up to rounding (e.g. equal weights that scale to 0.999...).
+        return prob, alias
+
+    deficit = np.cumsum(1.0 - scaled[small])
+    surplus = np.cumsum(scaled[large] - 1.0)
+
+    # A small column is filled by the first large column whose cumulative
+    # surplus covers the deficits of the small columns before it.
+    deficit_before = np.concatenate(([0.0], deficit[:-1]))
+    donor = np.minimum(np.searchsorted(surplus, deficit_before, side = "left"), len(large) - 1)
+    prob[small] = scaled[small]
+    alias[small] = large[donor]
+
+    # A large column drops below 1 once the deficits pass its cumulative
+    # surplus; the next large column fills it. The last one keeps prob = 1,
+    # which is exact up to rounding.
+    exhausted_at = np.searchsorted(deficit, surplus, side = "right")
+    demoted = np.flatnonzero(exhausted_at[:-1] < len(small))
+    prob[large[demoted]] = 1.0 - (deficit[exhausted_at[demoted]] - surplus[demoted])
+    alias[large[demoted]] = large[demoted + 1]
+
+    np.clip(prob, 0.0, 1.0, out = prob)
+    return prob, alias
+
+
+def zipf_weights(zipf) -> np.ndarray:
+    """Sampling weights 10 ** (zipf / ZIPF_TEMPERATURE), scaled so the largest is 1."""
+    zipf = np.asarray(zipf, dtype = np.float64)
+    if len(zipf) == 0:
+        return zipf
+    return np.power(10.0, (zipf - zipf.max()) / ZIPF_TEMPERATURE)
+
+
+class WeightedSampler:
+    """
+    Frequency-weighted sampling over words sorted by descending Zipf frequency.
+
+    Because of that order every Zipf range is a contiguous index range. Alias
+    tables for the ranges in `tables` (the whole list and each difficulty
+    level) are supplied up front; tables for other ranges are built on first
+    use and kept in a small LRU cache.
+    """
+
+    def __init__(self, zipf, tables : dict, max_cached : int = 32):
+        self.zipf = zipf
+        self.tables = tables
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+
+
+    def _bound(self, value : float, inclusive : bool) -> int:
+        """First index whose Zipf frequency is below `value` (at or below if not `inclusive`)."""
+        lo, hi = 0, len(self.zipf)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            z = float(self.zipf[mid])
+            if z > value or (inclusive and z == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+    def zipf_range(self, min_zipf : float = None, max_zipf : float = None) -> tuple:
+        """Index range of the words with `min_zipf <= zipf <= max_zipf`."""
+        # Stored values are float32 rounded to two decimals; compare with some slack.
+        start = 0 if max_zipf is None else self._bound(max_zipf + 1e-4, inclusive = False)
+        end = len(self.zipf) if min_zipf is None else self._bound(min_zipf - 1e-4, inclusive = True)
+        return start, max(start, end)
+
+
+    def table(self, start : int, end : int) -> tuple:
+        key = (start, end)
+        table = self.tables.get(key)
+        if table is not None:
+            return table
+
+        table = self._cache.get(key)
+        if table is None:
+            table = build_alias_table(zipf_weights(self.zipf[start:end]))
+            self._cache[key] = table
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last = False)
+        self._cache.move_to_end(key)
+
+        return table
+
+
+    def sample(self, n : int, start : int, end : int, rng : np.random.Generator = None) -> list:
+        """
+        Draw `n` distinct indices from [start, end), weighted by `zipf_weights`.
+
+        Draws are made in batches and duplicates discarded. Should a few very
+        frequent words keep winning, the rest is filled with the most frequent
+        indices not chosen yet, which are the most likely next draws anyway.
+        """
+        if n > end - start:
+            raise ValueError(f"Only {end - start} words in the requested range, {n} requested.")
+
+        rng = rng if rng is not None else np.random.default_rng()
+        prob, alias = self.table(start, end)
+
+        chosen = {}
+        for _ in range(16):
+            if len(chosen) >= n:
+                break
+
+            columns = rng.integers(0, len(prob), size = 4 * n)
+            accepted = rng.random(4 * n) < prob[columns]
+            for index in np.where(accepted, columns, alias[columns]).tolist():
+                chosen.setdefault(start + index, None)
+
+        chosen = list(chosen)[:n]
+        if len(chosen) < n:
+            taken = set(chosen)
+            remaining = (i for i in range(start, end) if i not in taken)
+            chosen.extend(islice(remaining, n - len(chosen)))
+
+        return chosen
@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import html
+import shutil
+import sqlite3
+import zipfile
+import hashlib
+import tempfile
+
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+# Fixed so that importing the same deck again updates its notes instead of
+# creating a second note type.
+MODEL_ID = 1718400000001
+MODEL_NAME = "Lumen Basic"
+
+SCHEMA = """
+CREATE TABLE col (
+    id integer primary key, crt integer not null, mod integer not null, scm integer not null,
+    ver integer not null, dty integer not null, usn integer not null, ls integer not null,
+    conf text not null, models text not null, decks text not null, dconf text not null, tags text not null
+);
+CREATE TABLE notes (
+    id integer primary key, guid text not null, mid integer not null, mod integer not null,
+    usn integer not null, tags text not null, flds text not null, sfld integer not null,
+    csum integer not null, flags integer not null, data text not null
+);
+CREATE TABLE cards (
+    id integer primary key, nid integer not null, did integer not null, ord integer not null,
+    mod integer not null, usn integer not null, type integer not null, queue integer not null,
+    due integer not null, ivl integer not null, factor integer not null, reps integer not null,
+    lapses integer not null, left integer not null, odue integer not null, odid integer not null,
+    flags integer not null, data text not null
+);
+CREATE TABLE revlog (
+    id integer primary key, cid integer not null, usn integer not null, ease integer not null,
+    ivl integer not null, lastIvl integer not null, factor real not null, time integer not null,
+    type integer not null
+);
+CREATE TABLE graves (usn integer not null, oid integer not null, type integer not null);
+CREATE INDEX ix_notes_usn on notes (usn);
+CREATE INDEX ix_cards_usn on cards (usn);
+CREATE INDEX ix_revlog_usn on revlog (usn);
+CREATE INDEX ix_cards_nid on cards (nid);
+CREATE INDEX ix_cards_sched on cards (did, queue, due);
+CREATE INDEX ix_revlog_cid on revlog (cid);
+CREATE INDEX ix_notes_csum on notes (csum);
+"""
+
+DECK_CONFIG = {
+    "1": {
+        "id": 1, "name": "Default", "mod": 0, "usn": 0, "maxTaken": 60, "autoplay": True,
+        "timer": 0, "replayq": True, "dyn": False,
+        "new": {"bury": True, "delays": [1, 10], "initialFactor": 2500, "ints": [1, 4, 7],
+                "order": 1, "perDay": 20, "separate": True},
+        "lapse": {"delays": [10], "leechAction": 0, "leechFails": 8, "minInt": 1, "mult": 0},
+        "rev": {"bury": True, "ease4": 1.3, "fuzz": 0.05, "ivlFct": 1, "maxIvl": 36500,
+                "minSpace": 1, "perDay": 100}
+    }
+}
+
+
+def _stable_id(*parts : str) -> int:
+    """A positive 52-bit id derived from `parts`, so rebuilding a deck keeps its ids."""
+    digest = hashlib.sha1("\x1f".join(parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") >> 12
+
+
+def _deck(deck_id : int, name : str, mod : int) -> dict:
+    return {
+        "id": deck_id, "name": name, "desc": "", "mod": mod, "usn": -1, "conf": 1, "dyn": 0,
+        "collapsed": False, "extendNew": 0, "extendRev": 50,
+        "newToday": [0, 0], "revToday": [0, 0], "lrnToday": [0, 0], "timeToday": [0, 0]
+    }
+
+
+def _model(deck_id : int, mod : int) -> dict:
+    field = {"font": "Arial", "media": [], "rtl": False, "size": 20, "sticky": False}
+    return {
+        "id": MODEL_ID, "name": MODEL_NAME, "type": 0, "mod": mod, "usn": -1, "sortf": 0,
+        "did": deck_id, "tags": [], "vers": [],
+        "flds": [{**field, "name": "Front", "ord": 0}, {**field, "name": "Back", "ord": 1}],
+        "tmpls": [{
+            "name": "Card 1", "ord": 0, "did": None, "bqfmt": "", "bafmt": "",
+            "qfmt": "{{Front}}",
+            "afmt": "{{FrontSide}}\n\n<hr id=answer>\n\n{{Back}}"
+        }],
+        "req": [[0, "all", [0]]],
+        "css": ".card {\n font-family: arial;\n font-size: 20px;\n text-align: center;\n color: black;\n background-color: white;\n}\n",
+        "latexPre": "\\documentclass[12pt]{article}\n\\special{papersize=3in,5in}\n\\usepackage[utf8]{inputenc}\n"
+                    "\\usepackage{amssymb,amsmath}\n\\pagestyle{empty}\n\\setlength{\\parindent}{0in}\n\\begin{document}\n",
+        "latexPost": "\\end{document}"
+    }
+
+
+def _write_collection(path : str, deck_name : str, translations : list, tags : list) -> int:
+    """Write the SQLite collection in one transaction; returns the number of notes."""
+    now = int(time.time())
+    now_ms = int(time.time() * 1000)
+    deck_id = _stable_id("deck", deck_name)
+
+    conf = {
+        "activeDecks": [1], "curDeck": deck_id, "curModel": str(MODEL_ID), "newSpread": 0,
+        "collapseTime": 1200, "timeLim": 0, "estTimes": True, "dueCounts": True,
+        "sortType": "noteFld", "sortBackwards": False, "addToCur": True, "nextPos": len(translations) + 1
+    }
+    decks = {"1": _deck(1, "Default", now), str(deck_id): _deck(deck_id, deck_name, now)}
+    tag_text = f" {' '.join(tags)} " if tags else ""
+
+    notes, cards = [], []
+    for position, item in enumerate(translations):
+        front, back = html.escape(item["source"]), html.escape(item.get("target", ""))
+        note_id, card_id = now_ms + position, now_ms + position
+        csum = int(hashlib.sha1(item["source"].encode("utf-8")).hexdigest()[:8], 16)
+        guid = f"{_stable_id('note', deck_name, item['source']):x}"
+
+        notes.append((note_id, guid, MODEL_ID, now, -1, tag_text, f"{front}\x1f{back}", front, csum, 0, ""))
+        # New cards, due in list order.
+        cards.append((card_id, note_id, deck_id, 0, now, -1, 0, 0, position + 1, 0, 0, 0, 0, 0, 0, 0, 0, ""))
+
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute(
+                "INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, '{}')",
+                (now, now_ms, now_ms, json.dumps(conf), json.dumps({str(MODEL_ID): _model(deck_id, now)}),
+                 json.dumps(decks), json.dumps(DECK_CONFIG))
+            )
+            connection.executemany("INSERT INTO notes VALUES (?,?,?,?,?,?,?,?,?,?,?)", notes)
+            connection.executemany("INSERT INTO cards VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", cards)
+    finally:
+        connection.close()
+
+    return len(notes)
+
+
+def build_apkg(path : str, deck_name : str, translations : list, tags : list = None, media_files : list = None) -> dict:
+    """
+    Write an Anki package (`.apkg`) holding one deck with a Front/Back card per
+    translation, without Anki, AnkiConnect or the clanki server.
+
+    `translations` is the `translations` list returned by `translate_words`
+    (`[{"source": ..., "target": ...}, ...]`); repeated source words are kept
+    once. The package is a legacy (schema 11) SQLite collection written in one
+    transaction and zipped with its media: `media_files` are copied in as is
+    and can be referenced from the cards as `[sound:<file name>]` or
+    `<img src="<file name>">`. Notes and the deck get ids derived from their
+    content, so importing a rebuilt deck updates the existing cards.
+    """
+    try:
+
+        translations = list({t["source"]: t for t in translations if t.get("source")}.values())
+        media_files = media_files or []
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            collection_path = os.path.join(tmp_dir, "collection.anki2")
+            cards = _write_collection(collection_path, deck_name, translations, tags or [])
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with zipfile.ZipFile(tmp_path, "w", compression = zipfile.ZIP_DEFLATED) as package:
+                package.write(collection_path, "collection.anki2")
+                package.writestr("media", json.dumps({str(i): os.path.basename(f) for i, f in enumerate(media_files)}))
+                for i, media_path in enumerate(media_files):
+                    with open(media_path, "rb") as source, package.open(str(i), "w") as target:
+                        shutil.copyfileobj(source, target)
+            os.replace(tmp_path, path)
+
+        logger.info(f"Wrote {cards} cards to {path}")
+        return {"path": path, "deck": deck_name, "cards": cards, "media": len(media_files)}
+
+    except Exception as e:
+        logger.error(f"Error while building Anki package {path} - {e}")
+        raise CustomException("Failed to build Anki package : ", e)
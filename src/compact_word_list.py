@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def encode_string_pool(strings : list) -> tuple:
+    """
+    Encode strings as one UTF-8 string pool: returns `(offsets, blob)` such that
+    string `i` is `blob[offsets[i]:offsets[i + 1]]`.
+    """
+    encoded = [s.encode("utf-8") for s in strings]
+
+    offsets = np.zeros(len(encoded) + 1, dtype = np.int64)
+    np.cumsum([len(s) for s in encoded], out = offsets[1:])
+
+    return offsets, np.frombuffer(b"".join(encoded), dtype = np.uint8)
+
+
+class CompactWordList:
+    """
+    Columnar word list: a UTF-8 string pool (`offsets` + `blob`, see
+    `encode_string_pool`), one uint8 `difficulty` code per word indexing into
+    `labels`, and the lemma's Zipf frequency in `zipf`.
+
+    This is the layout of the word store (`src.word_store`), which keeps
+    these arrays as memory-mapped `.npy` files.
+    """
+
+    def __init__(self, offsets, blob, difficulty, zipf, labels):
+        self.offsets = offsets
+        self.blob = blob
+        self.difficulty = difficulty
+        self.zipf = zipf
+        self.labels = [str(label) for label in labels]
+
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+    def word(self, index : int) -> str:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+
+    def words(self, indices) -> list:
+        return [self.word(i) for i in indices]
+
+
+    def difficulty_label(self, index : int) -> str:
+        return self.labels[self.difficulty[index]]
+
+
+    def indices_for_difficulty(self, label : str) -> np.ndarray:
+        """Indices of all words with the given difficulty label."""
+        if label not in self.labels:
+            return np.empty(0, dtype = np.int64)
+
+        return np.flatnonzero(self.difficulty == self.labels.index(label))
@@ -5,6 +5,7 @@ import shutil
 from utils.custom_exception import CustomException
 from utils.logger import get_logger
 from config.paths_config import *
+from config.models_list import SPACY_MODELS
 
 logger = get_logger(__name__)
 
@@ -14,11 +15,19 @@ class DataIngestion:
         self,
         repo_url: str,
         repo_dir: str,
-        output_dir: str
+        output_dir: str,
+        manifest = None,
+        force: bool = False,
+        incremental: bool = False,
+        languages: list = None
     ):
         self.repo_url = repo_url
         self.repo_dir = repo_dir
         self.output_dir = output_dir
+        self.manifest = manifest
+        self.force = force
+        self.incremental = incremental
+        self.languages = sorted(languages or SPACY_MODELS.keys())
 
     logger.info("Data Ingestion Initiated.")
 
@@ -38,55 +47,194 @@ class DataIngestion:
             raise CustomException(f"Failed to clone repo : ", e)
         
 
-    def create_output_folder(self):
-        """Create raw-word-list directory fresh."""
+    def get_repo_head(self) -> str:
+        """Return the commit hash currently checked out in the cloned repo."""
         try:
 
-            if os.path.exists(self.output_dir):
-                logger.info(f"[INFO] Removing existing output folder: {self.output_dir}")
-                shutil.rmtree(self.output_dir)
+            result = subprocess.run(
+                ["git", "-C", self.repo_dir, "rev-parse", "HEAD"],
+                check=True, capture_output=True, text=True
+            )
+            return result.stdout.strip()
 
-            os.makedirs(self.output_dir, exist_ok=True)
-            logger.info(f"[INFO] Created output folder: {self.output_dir}")
-        
         except Exception as e:
-            logger.error(f"Error while creating output folder - {e}")
-            raise CustomException(f"Failed to create output folder : ", e)
-        
+            logger.error(f"Error while reading repo HEAD - {e}")
+            raise CustomException(f"Failed to read repo HEAD : ", e)
+
+
+    def is_output_current(self, repo_head: str) -> bool:
+        """True when the output folder already holds a copy of `repo_head`."""
+        return (
+            not self.force
+            and self.manifest is not None
+            and self.manifest.get_ingested_head() == repo_head
+            and os.path.isdir(self.output_dir)
+        )
+
+
+    def git(self, *args) -> str:
+        result = subprocess.run(
+            ["git", "-C", self.repo_dir, *args],
+            check=True, capture_output=True, text=True
+        )
+        return result.stdout.strip()
+
+
+    def sync_sparse_repo(self):
+        """
+        Shallow, sparse clone or update of the repo, limited to `languages`.
+
+        Only the top-level language folders we process are checked out, and
+        only the latest commit is fetched.
+        """
+        try:
+
+            if not os.path.exists(self.repo_dir):
+                logger.info(f"[INFO] Sparse cloning repo: {self.repo_url}")
+                subprocess.run(
+                    ["git", "clone", "--depth", "1", "--filter=blob:none", "--sparse",
+                     self.repo_url, self.repo_dir],
+                    check=True, capture_output=True, text=True
+                )
+                self.git("sparse-checkout", "set", "--cone", *self.languages)
+                return
+
+            logger.info(f"[INFO] Fetching latest commit into {self.repo_dir}...")
+            self.git("sparse-checkout", "set", "--cone", *self.languages)
+            self.git("fetch", "--depth", "1", "origin", "HEAD")
+            self.git("reset", "--hard", "FETCH_HEAD")
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error while syncing sparse repo - {e.stderr}")
+            raise CustomException(f"Failed to sync sparse repo : ", e)
+
+        except Exception as e:
+            logger.error(f"Error while syncing sparse repo - {e}")
+            raise CustomException(f"Failed to sync sparse repo : ", e)
+
+
+    def synced_paths(self) -> list:
+        """Pathspecs mirrored into the output folder: the language folders, or the whole repo."""
+        return list(self.languages) if self.incremental else ["."]
 
 
-    def copy_repo_folders(self):
+    def previous_head(self):
+        """The commit the output folder reflects, or None when it must be synced in full."""
+        if self.force:
+            return None
+
+        # The manifest knows which commit the output folder reflects, even if a
+        # previous run updated the repo and then failed before copying.
+        old_head = self.manifest.get_ingested_head() if self.manifest is not None else None
+        if old_head is None and os.path.exists(self.repo_dir):
+            old_head = self.get_repo_head()
+        return old_head
+
+
+    def get_changed_files(self, old_head: str, new_head: str):
         """
-        Copy all folders and files from cloned repo into raw-word-list directory.
-        Excludes .git folder.
+        List (status, path) pairs changed between two commits in the synced
+        paths, or None when the old commit is no longer available.
         """
         try:
-            logger.info(f"[INFO] Copying repo contents into: {self.output_dir}")
+            output = self.git("diff", "--name-status", "--no-renames", "-z",
+                              old_head, new_head, "--", *self.synced_paths())
+        except subprocess.CalledProcessError as e:
+            logger.info(f"[INFO] Cannot diff {old_head}..{new_head}, falling back to a full sync - {e.stderr}")
+            return None
+
+        # -z output alternates status and path, NUL separated.
+        fields = [field for field in output.split("\0") if field]
+        return [(status[0], path) for status, path in zip(fields[0::2], fields[1::2])]
+
+
+    def link_or_copy_file(self, relative_path: str):
+        """Hard-link a checked-out file into the output folder, copying across filesystems."""
+        source_path = os.path.join(self.repo_dir, relative_path)
+        dest_path = os.path.join(self.output_dir, relative_path)
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+
+        # git replaces files instead of rewriting them in place, so a link
+        # keeps pointing at the old content until we re-link it.
+        try:
+            os.link(source_path, dest_path)
+        except OSError:
+            shutil.copy2(source_path, dest_path)
 
-            for item in os.listdir(self.repo_dir):
-                source_path = os.path.join(self.repo_dir, item)
 
-                # skip git metadata
-                if item == ".git":
-                    continue
+    def remove_output_file(self, relative_path: str):
+        dest_path = os.path.join(self.output_dir, relative_path)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
 
-                dest_path = os.path.join(self.output_dir, item)
 
-                if os.path.isdir(source_path):
-                    shutil.copytree(source_path, dest_path)
+    def sync_output_files(self, old_head, new_head: str):
+        """
+        Bring the output folder from `old_head` to `new_head`, touching only
+        changed files. Files the pipeline generated next to the word lists
+        (cleaned lists, word stores, lexicons) are never removed, so languages
+        whose input did not change are not reprocessed.
+        """
+        try:
+
+            changes = None
+            if old_head and os.path.isdir(self.output_dir):
+                changes = self.get_changed_files(old_head, new_head)
+
+            if changes is None:
+                logger.info(f"[INFO] Linking all repo files into: {self.output_dir}")
+                tracked = self.git("ls-files", "-z", "--", *self.synced_paths())
+                changes = [("A", path) for path in tracked.split("\0") if path]
+
+            for status, path in changes:
+                if status == "D":
+                    self.remove_output_file(path)
                 else:
-                    shutil.copy2(source_path, dest_path)
+                    self.link_or_copy_file(path)
+
+            logger.info(f"[SUCCESS] Synced {len(changes)} changed file(s) into {self.output_dir}")
 
-            logger.info("[SUCCESS] All folders copied into raw-word-list successfully!")
-        
         except Exception as e:
-            logger.error(f"Error while copying repo folders - {e}")
-            raise CustomException(f"Failed to copy repo folders : ", e)
-        
+            logger.error(f"Error while syncing output files - {e}")
+            raise CustomException(f"Failed to sync output files : ", e)
+
+
+    def run_incremental(self):
+        """Sparse fetch, then update only the files that changed since the last ingestion."""
+        old_head = self.previous_head()
+
+        self.sync_sparse_repo()
+        new_head = self.get_repo_head()
+
+        if old_head == new_head and os.path.isdir(self.output_dir):
+            logger.info(f"[INFO] {self.output_dir} is already at {new_head}, nothing to sync.")
+            return
+
+        self.sync_output_files(old_head, new_head)
+
+        if self.manifest is not None:
+            self.manifest.record_ingestion(new_head)
+            self.manifest.save()
+
 
     def run(self):
+        if self.incremental:
+            self.run_incremental()
+            return
+
+        old_head = self.previous_head()
         self.clone_or_pull_repo()
-        self.create_output_folder()
-        self.copy_repo_folders()
 
+        repo_head = self.get_repo_head()
+        if self.is_output_current(repo_head):
+            logger.info(f"[INFO] {self.output_dir} is already at {repo_head}, skipping copy.")
+            return
+
+        self.sync_output_files(old_head, repo_head)
 
+        if self.manifest is not None:
+            self.manifest.record_ingestion(repo_head)
+            self.manifest.save()
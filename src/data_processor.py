@@ -1,19 +1,49 @@
+from __future__ import annotations
+
 import csv
 import sys
 import os
+import io
 import json
 import subprocess
-import pandas as pd
-import spacy
-import spacy_transformers
+import time
+import pstats
+import cProfile
+import multiprocessing
+import importlib.metadata
+from typing import TYPE_CHECKING
+from contextlib import contextmanager
 
 from string import punctuation
-from wordfreq import zipf_frequency
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 from config.paths_config import *
 from config.models_list import SPACY_MODELS
+from src.run_manifest import RunManifest
+from src.lemma_cache import LemmaCache
+from src.word_store import build_word_store, CURRENT_FILE, FORMAT_VERSION as WORD_STORE_FORMAT
+from config.config import (
+    TRF_MODEL_MEMORY_GB,
+    LG_MODEL_MEMORY_GB,
+    PARALLEL_MAX_WORKERS,
+    PARALLEL_MEMORY_BUDGET_GB,
+    DIFFICULTY_BINS,
+    DIFFICULTY_LABELS,
+    DEFAULT_LEMMA_MODE,
+    LEMMA_MODES,
+    LEMMA_N_PROCESS,
+    STREAM_CHUNK_WORDS,
+    STREAM_READ_BYTES
+)
 from utils.logger import get_logger
 from utils.custom_exception import CustomException
+from utils.run_report import RunReport, track_peak_rss
+
+# pandas, spaCy and the lemma/frequency engines are imported where they are
+# first used, so importing this module (e.g. for `--help`) stays cheap.
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = get_logger(__name__)
 
@@ -23,17 +53,120 @@ class DataProcessor:
     def __init__(self, 
                 models_list : dict, 
                 data_dir : str,
+                manifest = None,
+                lemma_cache_path : str = LEMMA_CACHE_PATH,
+                n_process : int = LEMMA_N_PROCESS,
+                streaming : bool = False,
+                report : RunReport = None,
+                profile_language : str = None,
                 ):
         
         self.spacy_models = models_list
         self.data_dir = data_dir
+        self.manifest = manifest
+        self.lemma_cache_path = lemma_cache_path
+        self.lemma_cache = None
+        self.n_process = n_process
+        self.streaming = streaming
+        self.report = report if report is not None else RunReport()
+        self.profile_language = profile_language
         self.nlp = None
+        self.lemma_model = None
+        self.lemma_model_version = None
 
         os.makedirs(self.data_dir, exist_ok = True)
 
         logger.info("Data Processor Initialized.")
 
     
+    def raw_word_list_path(self, language : str) -> str:
+        return os.path.join(self.data_dir, language, f"{language}.txt")
+
+
+    def cleaned_word_list_path(self, language : str) -> str:
+        return os.path.join(self.data_dir, language, CLEANED_WORD_LIST_FILE)
+
+
+    def lemma_mode(self, language : str) -> str:
+        return LEMMA_MODES.get(language, DEFAULT_LEMMA_MODE)
+
+
+    def word_store_dir(self, language : str) -> str:
+        return os.path.join(self.data_dir, language, WORD_STORE_DIR)
+
+
+    def language_fingerprint(self, language : str) -> dict:
+        """Everything a language's cleaned word list depends on."""
+        import spacy
+
+        model_name = self.spacy_models[language]
+
+        return {
+            "input_hash": RunManifest.hash_file(self.raw_word_list_path(language)),
+            "spacy_model": model_name,
+            "spacy_model_version": spacy.util.get_package_version(model_name),
+            "lemma_mode": self.lemma_mode(language),
+            "wordfreq_version": importlib.metadata.version("wordfreq"),
+            "difficulty_bins": list(DIFFICULTY_BINS),
+            "difficulty_labels": list(DIFFICULTY_LABELS),
+            "word_store_format": WORD_STORE_FORMAT
+        }
+
+
+    def select_languages(self, force : bool = False) -> tuple:
+        """
+        Return `(selected, failures)`: the languages that need processing mapped
+        to their fingerprints, and the languages whose fingerprint could not be
+        computed (e.g. `<language>.txt` was deleted upstream) mapped to the error.
+
+        Without a manifest, or with `force`, every language is selected. Otherwise
+        a language is skipped when its fingerprint matches the manifest and its
+        cleaned word lists are still on disk. A failing language does not stop
+        the selection of the others.
+        """
+        try:
+
+            selected = {}
+            failures = {}
+
+            for language in self.spacy_models.keys():
+                try:
+                    fingerprint = self.language_fingerprint(language)
+                except Exception as e:
+                    failures[language] = f"Cannot fingerprint inputs - {e}"
+                    logger.error(f"Skipping {language}: {failures[language]}")
+                    continue
+
+                if (not force
+                        and self.manifest is not None
+                        and self.manifest.is_up_to_date(language, fingerprint)
+                        and os.path.exists(self.cleaned_word_list_path(language))
+                        and os.path.exists(os.path.join(self.word_store_dir(language), CURRENT_FILE))):
+                    logger.info(f"Skipping {language}: inputs unchanged since last run.")
+                    continue
+
+                selected[language] = fingerprint
+
+            return selected, failures
+
+        except Exception as e:
+            logger.error(f"Error while selecting languages to process - {e}")
+            raise CustomException("Failed to select languages : ", e)
+
+
+    def _record_processed(self, language : str, fingerprint : dict):
+        if self.manifest is not None:
+            self.manifest.record_language(language, fingerprint)
+            self.manifest.save()
+
+
+    def _record_failure(self, language : str, stage : str, error : str):
+        self.report.add_failure(language, stage, error)
+        if self.manifest is not None:
+            self.manifest.record_failure(language, error)
+            self.manifest.save()
+
+
     def create_language_dirs(self):
         try:
 
@@ -50,9 +183,11 @@ class DataProcessor:
         
     
     def load_and_clean_word_list(self, language : str) -> pd.DataFrame:   
+        import pandas as pd
+
         try: 
 
-            with open(f"{RAW_WORD_LIST_DIR}/{language}/{language}.txt", "r", encoding = "utf-8") as f:
+            with open(self.raw_word_list_path(language), "r", encoding = "utf-8") as f:
                 word_list = f.read().split(",")
 
             word_df = pd.DataFrame({
@@ -68,13 +203,175 @@ class DataProcessor:
             raise CustomException("Failed to load and clean word list : ", e)    
         
     
+    def iter_word_chunks(self, language : str,
+                               chunk_size : int = STREAM_CHUNK_WORDS,
+                               read_size : int = STREAM_READ_BYTES):
+        """
+        Stream `<language>.txt` as lists of at most `chunk_size` cleaned words.
+
+        The file is read `read_size` characters at a time; a word cut at a block
+        boundary is carried over to the next block. Words are stripped of
+        punctuation like in `load_and_clean_word_list`, and empty ones dropped.
+        """
+        try:
+
+            chunk = []
+            remainder = ""
+
+            with open(self.raw_word_list_path(language), "r", encoding = "utf-8") as f:
+                for block in iter(lambda: f.read(read_size), ""):
+                    tokens = (remainder + block).split(",")
+                    remainder = tokens.pop()
+
+                    for token in tokens:
+                        word = token.strip(punctuation)
+                        if word:
+                            chunk.append(word)
+
+                    while len(chunk) >= chunk_size:
+                        yield chunk[:chunk_size]
+                        chunk = chunk[chunk_size:]
+
+            word = remainder.strip(punctuation)
+            if word:
+                chunk.append(word)
+
+            if chunk:
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"Error while streaming word list - {e}")
+            raise CustomException("Failed to stream word list : ", e)
+
+
+    def build_lemma_table_streaming(self, language : str,
+                                          chunk_size : int = STREAM_CHUNK_WORDS,
+                                          batch_size : int = 1000) -> pd.DataFrame:
+        """
+        Lemmatize and score the word list chunk by chunk.
+
+        Each chunk is lemmatized in bounded `nlp.pipe` batches and folded into a
+        running lemma -> (word, zipf) table, so memory is bounded by the number of
+        distinct lemmas rather than by the size of the raw file. The first word
+        seen for a lemma is kept, which is the row `clean_up_and_export` keeps.
+        """
+        import pandas as pd
+        from src.frequency_engine import ZipfFrequencyEngine
+
+        try:
+
+            language_group = self.spacy_models[language].split("_")[0]
+            engine = ZipfFrequencyEngine(language_group)
+
+            table = {}
+            total_words = 0
+            lemmatized_words = 0
+            seconds = {"load": 0.0, "lemma": 0.0, "frequency": 0.0}
+            peaks = {"load": None, "lemma": None, "frequency": None}
+
+            @contextmanager
+            def measure(stage):
+                # Stages interleave chunk by chunk: times add up, the peak is the highest of any chunk.
+                start = time.perf_counter()
+                with track_peak_rss() as rss:
+                    yield
+                seconds[stage] += time.perf_counter() - start
+                if rss["peak"] is not None:
+                    peaks[stage] = max(peaks[stage] or 0, rss["peak"])
+
+            chunks = self.iter_word_chunks(language, chunk_size)
+
+            while True:
+                with measure("load"):
+                    chunk = next(chunks, None)
+
+                if chunk is None:
+                    break
+
+                total_words += len(chunk)
+
+                with measure("lemma"):
+                    words = list(dict.fromkeys(chunk))
+                    lemmas = self.lemmatize_words(words, batch_size = batch_size)
+                    lemmatized_words += len(words)
+
+                    new_rows = {}
+                    for word in words:
+                        lemma = lemmas[word]
+                        if lemma not in table and lemma not in new_rows:
+                            new_rows[lemma] = word
+
+                with measure("frequency"):
+                    if new_rows:
+                        frequencies = engine.lookup(list(new_rows))
+                        for (lemma, word), frequency in zip(new_rows.items(), frequencies):
+                            table[lemma] = (word, frequency)
+
+                logger.info(f"Streamed {total_words} words, {len(table)} distinct lemmas so far")
+
+            self.report.add(language, "load", seconds["load"], total_words, peaks["load"])
+            self.report.add(language, "lemma", seconds["lemma"], lemmatized_words, peaks["lemma"])
+            self.report.add(language, "frequency", seconds["frequency"], len(table), peaks["frequency"])
+
+            return pd.DataFrame({
+                "word": [word for word, _ in table.values()],
+                "lemma": list(table.keys()),
+                "zipf_freq_lemma": [frequency for _, frequency in table.values()]
+            })
+
+        except Exception as e:
+            logger.error(f"Error while building lemma table - {e}")
+            raise CustomException("Failed to build lemma table : ", e)
+
+
+    def get_lemma_cache(self):
+        if self.lemma_cache is None and self.lemma_cache_path:
+            self.lemma_cache = LemmaCache(self.lemma_cache_path)
+        return self.lemma_cache
+
+
+    def lemmatize_words(self, words : list,
+                              batch_size : int = 1000) -> dict:
+        """
+        Lemmatize unique, non-empty `words` and return a word -> lemma dictionary.
+
+        Words already in the lemma cache for the loaded model are served from it;
+        only the misses go through `nlp.pipe` and are then added to the cache.
+        """
+        cache = self.get_lemma_cache()
+
+        lemmas = cache.get_many(self.lemma_model, self.lemma_model_version, words) if cache else {}
+        misses = [w for w in words if w not in lemmas]
+
+        logger.info(f"Lemma cache: {len(lemmas)} hits, {len(misses)} misses")
+
+        if misses:
+            docs = self.nlp.pipe(misses, batch_size = batch_size, n_process = self.n_process)
+            new_lemmas = {word: doc[0].lemma_ for word, doc in zip(misses, docs)}
+
+            if cache:
+                cache.put_many(self.lemma_model, self.lemma_model_version, new_lemmas)
+
+            lemmas.update(new_lemmas)
+
+        return lemmas
+
+
     def add_lemma(self, df : pd.DataFrame,
                         batch_size : int = 1000) -> pd.DataFrame:
         try:
 
-            docs = self.nlp.pipe(df["word"].to_list(), batch_size = batch_size)
-            lemmas = [doc[0].lemma_ for doc in docs]
-            df["lemma"] = pd.DataFrame(lemmas, index = df.index)
+            # Duplicate words lemmatize identically and empty strings (left over
+            # by strip(punctuation)) have no token to lemmatize, so neither needs
+            # a trip through the pipeline.
+            df = (
+                df[df["word"] != ""]
+                .drop_duplicates(subset = "word")
+                .reset_index(drop = True)
+            )
+
+            lemmas = self.lemmatize_words(df["word"].to_list(), batch_size = batch_size)
+            df["lemma"] = df["word"].map(lemmas)
 
             return df
 
@@ -85,10 +382,17 @@ class DataProcessor:
     
     def add_word_frequencies(self, df : pd.DataFrame,
                          language : str)-> pd.DataFrame :
+        import pandas as pd
+        from src.frequency_engine import ZipfFrequencyEngine
+
         try:
             
             language_group = self.spacy_models[language].split("_")[0]
-            df["zipf_freq_lemma"] = [zipf_frequency(w, language_group) for w in df["lemma"]]
+            engine = ZipfFrequencyEngine(language_group)
+
+            # Look every distinct lemma up once and broadcast back onto the rows.
+            codes, unique_lemmas = pd.factorize(df["lemma"])
+            df["zipf_freq_lemma"] = engine.lookup(unique_lemmas)[codes]
 
             return df
         
@@ -98,68 +402,302 @@ class DataProcessor:
         
     
     def clean_up_and_export(self, df : pd.DataFrame, language : str) -> None:
+        import pandas as pd
+
         try:
 
+            # zipf_freq_lemma only depends on the lemma, so the max-frequency row
+            # of each lemma is its first row.
             df = (
-                df.loc[df.groupby("lemma", sort = False)["zipf_freq_lemma"].idxmax()]
+                df.drop_duplicates(subset = "lemma", keep = "first")
                 .reset_index(drop = True)
             )
 
             df = df[(df["zipf_freq_lemma"] > 0)]
 
-            df.loc[:, "word_difficulty"] = pd.cut(
+            difficulty = pd.cut(
                 df["zipf_freq_lemma"],
-                bins = [-float("inf"), 2.0, 4.0, float("inf")],
-                labels = ["advanced", "intermediate", "beginner"],
+                bins = DIFFICULTY_BINS,
+                labels = DIFFICULTY_LABELS,
                 include_lowest = True,
                 right = True
             )
+            df.loc[:, "word_difficulty"] = difficulty
+
+            build_word_store(
+                self.word_store_dir(language),
+                words = df["lemma"].to_list(),
+                difficulty_codes = difficulty.cat.codes.to_numpy(),
+                zipf_frequencies = df["zipf_freq_lemma"].to_numpy(),
+                difficulty_labels = DIFFICULTY_LABELS
+            )
 
-            df = df.drop(columns = ["word", "zipf_freq_lemma"])
+            # zipf_freq_lemma stays in the export for frequency-weighted sampling.
+            df = df.drop(columns = ["word"])
             df = df.rename(columns = {
                 "lemma" : "word"
             })
 
-            df.to_json(f"{RAW_WORD_LIST_DIR}/{language}/word-list-cleaned.json", orient = "index")
+            df.to_json(self.cleaned_word_list_path(language), orient = "index")
     
         except Exception as e:
             logger.error(f"Error while cleaning up and exporting data - {e}")
             raise CustomException("Failed to clean and export data : ", e)
     
 
-    def create_clean_word_list(self, language : str) -> None:
-        try:
+    def run_language_stages(self, language : str) -> None:
+        """Run every processing stage for `language`, timing each one."""
+        from src.lemma_pipeline import build_lemma_pipeline
 
-            self.nlp = spacy.load(self.spacy_models[language], disable = ["parser", "ner", "textcat"])
+        with self.report.stage(language, "model_load"):
+            self.nlp, self.lemma_model, self.lemma_model_version = build_lemma_pipeline(
+                self.spacy_models[language], self.lemma_mode(language)
+            )
+
+        if self.streaming:
+            logger.info("Stream, lemmatise and score the dataset")
+            lang_df = self.build_lemma_table_streaming(language)
 
+        else:
             logger.info("Load in dataset")
-            lang_df = self.load_and_clean_word_list(language)
+            with self.report.stage(language, "load") as timer:
+                lang_df = self.load_and_clean_word_list(language)
+                timer["words"] = len(lang_df)
 
             logger.info("Lemmatise Words")
-            lang_df = self.add_lemma(lang_df, self.nlp)
+            with self.report.stage(language, "lemma") as timer:
+                lang_df = self.add_lemma(lang_df)
+                timer["words"] = len(lang_df)
 
             logger.info("Add the word frequencies")
-            lang_df = self.add_word_frequencies(lang_df, language)
+            with self.report.stage(language, "frequency", words = len(lang_df)):
+                lang_df = self.add_word_frequencies(lang_df, language)
 
-            logger.info("Do the final clean ups and export the file")
+        logger.info("Do the final clean ups and export the file")
+        with self.report.stage(language, "export", words = len(lang_df)):
             self.clean_up_and_export(lang_df, language)
 
+
+    def create_clean_word_list(self, language : str) -> None:
+        try:
+
+            if language != self.profile_language:
+                self.run_language_stages(language)
+                return None
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                self.run_language_stages(language)
+            finally:
+                profiler.disable()
+                self.save_profile(profiler, language)
+
             return None
     
         except Exception as e:
             logger.error(f"Error while creating clean word list - {e}")
             raise CustomException("Failed to clean word list : ", e)
+
+
+    def save_profile(self, profiler : cProfile.Profile, language : str) -> str:
+        os.makedirs(REPORTS_DIR, exist_ok = True)
+        path = os.path.join(REPORTS_DIR, f"profile-{language}-{self.report.started_at.strftime('%Y-%m-%d_%H-%M-%S')}.prof")
+        profiler.dump_stats(path)
+
+        stats = io.StringIO()
+        pstats.Stats(profiler, stream = stats).sort_stats("cumulative").print_stats(25)
+        logger.info(f"cProfile for {language} saved to {path}\n{stats.getvalue()}")
+
+        return path
     
 
-    def process_all_languages(self):
-        try:
+    def estimate_model_memory(self, language : str) -> float:
+        """Approximate memory (GB) a worker needs to process `language`."""
+        if self.spacy_models[language].endswith("_trf"):
+            return TRF_MODEL_MEMORY_GB
+        return LG_MODEL_MEMORY_GB
 
-            for language in self.spacy_models.keys():
-                logger.info(f"Processing language: {language}")
+
+    def process_all_languages(self,
+                              parallel : bool = False,
+                              max_workers : int = None,
+                              memory_budget_gb : float = None,
+                              force : bool = False) -> dict:
+        """
+        Create the cleaned word list for every language in `spacy_models`.
+
+        When a run manifest is attached, languages whose inputs are unchanged
+        since the last successful run are skipped unless `force` is set.
+
+        In parallel mode each language runs in its own worker process, which
+        loads its own spaCy model. The number of languages in flight is capped
+        by `max_workers` and by the estimated model memory in `memory_budget_gb`.
+
+        In both modes a failing language, including one whose inputs cannot be
+        read, is logged, recorded in the run report and manifest, and does not
+        stop the others.
+
+        :return: A dictionary mapping each failed language to its error message.
+        """
+        languages, failures = self.select_languages(force)
+
+        for language, error in failures.items():
+            self._record_failure(language, "select", error)
+
+        if not languages:
+            logger.info("No language needs processing.")
+            return failures
+
+        if parallel:
+            failures.update(self._process_languages_in_parallel(languages, max_workers, memory_budget_gb))
+            return failures
+
+        for language, fingerprint in languages.items():
+            logger.info(f"Processing language: {language}")
+
+            try:
                 self.create_clean_word_list(language)
-        
+            except Exception as e:
+                failures[language] = str(e)
+                self._record_failure(language, "process", str(e))
+                logger.error(f"Failed to process language {language} - {e}")
+                continue
+
+            self._record_processed(language, fingerprint)
+
+        if failures:
+            logger.error(f"{len(failures)} language(s) failed: {', '.join(failures)}")
+
+        return failures
+
+
+    def worker_options(self) -> dict:
+        """Constructor options for the DataProcessor in each worker process."""
+        return {
+            "lemma_cache_path": self.lemma_cache_path,
+            "streaming": self.streaming,
+            "profile_language": self.profile_language,
+            # The language already has a process of its own, so nlp.pipe stays in it.
+            "n_process": 1
+        }
+
+
+    def _process_languages_in_parallel(self,
+                                       languages : dict,
+                                       max_workers : int = None,
+                                       memory_budget_gb : float = None) -> dict:
+        max_workers = max(1, max_workers or PARALLEL_MAX_WORKERS)
+        memory_budget_gb = memory_budget_gb or PARALLEL_MEMORY_BUDGET_GB
+
+        pending = list(languages.keys())
+        running = {}
+        failures = {}
+        # Languages whose worker pool broke under them. A dying worker breaks
+        # every future of its pool, so each one is retried once, alone, and
+        # only counts as failed if it dies again by itself.
+        run_alone = set()
+        memory_in_use = 0.0
+        executor = None
+
+        logger.info(f"Processing {len(pending)} languages in parallel "
+                    f"(max_workers={max_workers}, memory_budget_gb={memory_budget_gb})")
+
+        try:
+
+            while pending or running:
+
+                if executor is None:
+                    # One task per child so a worker releases its model's memory
+                    # as soon as its language is done.
+                    executor = ProcessPoolExecutor(
+                        max_workers = max_workers,
+                        mp_context = multiprocessing.get_context("spawn"),
+                        max_tasks_per_child = 1
+                    )
+
+                # Start every pending language that fits the worker and memory
+                # budget. A language larger than the budget still runs, alone.
+                index = 0
+                while index < len(pending) and len(running) < max_workers:
+                    if any(alone for _, _, _, alone in running.values()):
+                        break
+
+                    language = pending[index]
+                    alone = language in run_alone
+                    if alone and running:
+                        # Let the pool drain, then run it by itself.
+                        break
+
+                    memory = self.estimate_model_memory(language)
+
+                    if running and memory_in_use + memory > memory_budget_gb:
+                        index += 1
+                        continue
+
+                    future = executor.submit(_process_language, self.spacy_models,
+                                             self.data_dir, self.worker_options(), language)
+                    running[future] = (language, memory, executor, alone)
+                    memory_in_use += memory
+                    pending.pop(index)
+                    logger.info(f"Started processing language: {language}" + (" (alone)" if alone else ""))
+
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+
+                for future in done:
+                    language, memory, owner, alone = running.pop(future)
+                    memory_in_use -= memory
+
+                    try:
+                        error, records = future.result()
+                        self.report.extend(records)
+                    except BrokenProcessPool as e:
+                        error = f"Worker process died: {e}"
+                        if owner is executor:
+                            executor.shutdown(wait = False, cancel_futures = True)
+                            executor = None
+                        if not alone:
+                            logger.warning(f"Worker pool broke while processing {language}; retrying it alone")
+                            run_alone.add(language)
+                            pending.insert(0, language)
+                            continue
+                    except Exception as e:
+                        error = str(e)
+
+                    if error:
+                        failures[language] = error
+                        self._record_failure(language, "process", error)
+                        logger.error(f"Failed to process language {language} - {error}")
+                    else:
+                        self._record_processed(language, languages[language])
+                        logger.info(f"Finished processing language: {language}")
+
         except Exception as e:
-            logger.error(f"Error while processing all languages - {e}")
-            raise CustomException("Failed to process languages : ", e)
-        
+            logger.error(f"Error while processing languages in parallel - {e}")
+            raise CustomException("Failed to process languages in parallel : ", e)
+
+        finally:
+            if executor is not None:
+                executor.shutdown(wait = True, cancel_futures = True)
+
+        if failures:
+            logger.error(f"{len(failures)} language(s) failed: {', '.join(failures)}")
+
+        return failures
+
+
+def _process_language(models_list : dict, data_dir : str, options : dict, language : str):
+    """Worker entry point: process one language in a fresh process.
+
+    Returns `(error, records)`: the error message (None on success), sent as a
+    plain string instead of a pickled exception, and the worker's run report
+    records.
+    """
+    processor = DataProcessor(models_list, data_dir, **options)
+
+    try:
+        processor.create_clean_word_list(language)
+        return None, processor.report.records
 
+    except Exception as e:
+        return str(e), processor.report.records
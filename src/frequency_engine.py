@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+from wordfreq import get_frequency_dict, zipf_frequency
+
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+class ZipfFrequencyEngine:
+    """
+    Bulk Zipf frequency lookup for one language.
+
+    The language's frequency table is loaded once and shared by every engine
+    for the same (language, wordlist). Plain lowercase alphabetic words are
+    looked up directly in the table, reproducing `wordfreq.zipf_frequency`
+    (3 significant digits on the frequency, 2 decimals on the Zipf value).
+    Anything that wordfreq would normalise or split into several tokens goes
+    through `zipf_frequency` itself, so results are identical either way.
+    """
+
+    _tables = {}
+
+    # zipf_frequency(..., minimum=0) floors frequencies at zipf_to_freq(0).
+    MIN_FREQUENCY = 1e-9
+
+    def __init__(self, language_code : str, wordlist : str = "best"):
+        self.language_code = language_code
+        self.wordlist = wordlist
+        self.table = self.load_table(language_code, wordlist)
+
+
+    @classmethod
+    def load_table(cls, language_code : str, wordlist : str = "best") -> dict:
+        key = (language_code, wordlist)
+
+        if key not in cls._tables:
+            try:
+                logger.info(f"Loading word frequency table for '{language_code}'")
+                cls._tables[key] = get_frequency_dict(language_code, wordlist)
+
+            except Exception as e:
+                logger.error(f"Error while loading frequency table for {language_code} - {e}")
+                raise CustomException("Failed to load frequency table : ", e)
+
+        return cls._tables[key]
+
+
+    @classmethod
+    def frequency_to_zipf(cls, frequency : float) -> float:
+        frequency = max(frequency, cls.MIN_FREQUENCY)
+        leading_zeroes = math.floor(-math.log(frequency, 10))
+        frequency = round(frequency, leading_zeroes + 3)
+        return round(math.log10(frequency) + 9, 2)
+
+
+    def zipf(self, word : str) -> float:
+        if word.isalpha() and word == word.casefold():
+            frequency = self.table.get(word)
+            if frequency is not None:
+                return self.frequency_to_zipf(frequency)
+
+        return zipf_frequency(word, self.language_code, self.wordlist)
+
+
+    def lookup(self, words) -> np.ndarray:
+        """Return the Zipf frequency of each of `words` as a float64 array."""
+        return np.fromiter((self.zipf(w) for w in words), dtype = np.float64, count = len(words))
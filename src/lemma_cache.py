@@ -0,0 +1,89 @@
+import os
+import sqlite3
+
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+class LemmaCache:
+    """
+    On-disk word -> lemma cache backed by SQLite.
+
+    Entries are keyed by spaCy model name and version, so upgrading a model
+    never serves lemmas produced by the old one. The database runs in WAL
+    mode so that parallel language workers can share the same file.
+    """
+
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, path : str):
+        self.path = path
+
+        try:
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+
+            self.conn = sqlite3.connect(self.path, timeout = 60)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lemmas (
+                    model TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    lemma TEXT NOT NULL,
+                    PRIMARY KEY (model, model_version, word)
+                ) WITHOUT ROWID
+                """
+            )
+            self.conn.commit()
+
+        except Exception as e:
+            logger.error(f"Error while opening lemma cache - {e}")
+            raise CustomException("Failed to open lemma cache : ", e)
+
+
+    def get_many(self, model : str, model_version : str, words : list) -> dict:
+        """Return the cached lemmas for `words` as a word -> lemma dictionary."""
+        try:
+
+            found = {}
+
+            for start in range(0, len(words), self.QUERY_CHUNK_SIZE):
+                chunk = words[start:start + self.QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT word, lemma FROM lemmas "
+                    f"WHERE model = ? AND model_version = ? AND word IN ({placeholders})",
+                    [model, model_version, *chunk]
+                )
+                found.update(rows)
+
+            return found
+
+        except Exception as e:
+            logger.error(f"Error while reading lemma cache - {e}")
+            raise CustomException("Failed to read lemma cache : ", e)
+
+
+    def put_many(self, model : str, model_version : str, lemmas : dict):
+        try:
+
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO lemmas (model, model_version, word, lemma) VALUES (?, ?, ?, ?)",
+                    ((model, model_version, word, lemma) for word, lemma in lemmas.items())
+                )
+
+        except Exception as e:
+            logger.error(f"Error while writing lemma cache - {e}")
+            raise CustomException("Failed to write lemma cache : ", e)
+
+
+    def close(self):
+        self.conn.close()
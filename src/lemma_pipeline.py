@@ -0,0 +1,68 @@
+import importlib.metadata
+
+import spacy
+# Registers the transformer architectures used by the *_trf models.
+import spacy_transformers
+
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+LEMMA_MODES = ("full", "lemma", "lookup")
+
+# Components a trained lemmatizer can depend on: the shared embedding layer,
+# the taggers that feed POS/morph features to rule lemmatizers, and the
+# lemmatizers themselves.
+LEMMA_COMPONENTS = {
+    "transformer",
+    "curated_transformer",
+    "tok2vec",
+    "tagger",
+    "morphologizer",
+    "attribute_ruler",
+    "lemmatizer",
+    "trainable_lemmatizer"
+}
+
+
+def build_lemma_pipeline(model_name : str, mode : str = "full"):
+    """
+    Build the spaCy pipeline used to lemmatize single words.
+
+    :param model_name: Installed spaCy package, e.g. `de_dep_news_trf`.
+    :param mode: "full" loads the model without parser/ner/textcat, "lemma" keeps
+        only the components in `LEMMA_COMPONENTS`, and "lookup" builds a blank
+        tokenizer with a lookup-table lemmatizer for the model's language.
+    :return: A tuple `(nlp, cache_key, version)` where `cache_key` and `version`
+        identify the lemmas it produces in the lemma cache.
+    """
+    try:
+
+        if mode not in LEMMA_MODES:
+            raise ValueError(f"Unknown lemma mode '{mode}', expected one of {LEMMA_MODES}")
+
+        if mode == "full":
+            nlp = spacy.load(model_name, disable = ["parser", "ner", "textcat"])
+            return nlp, model_name, nlp.meta.get("version", "")
+
+        if mode == "lemma":
+            meta = spacy.util.get_model_meta(spacy.util.get_package_path(model_name))
+            components = meta.get("components", meta.get("pipeline", []))
+            exclude = [name for name in components if name not in LEMMA_COMPONENTS]
+
+            nlp = spacy.load(model_name, exclude = exclude)
+            logger.info(f"Lemma-only pipeline for {model_name}: {nlp.pipe_names}")
+            return nlp, f"{model_name}+lemma", nlp.meta.get("version", "")
+
+        language_code = model_name.split("_")[0]
+        nlp = spacy.blank(language_code)
+        nlp.add_pipe("lemmatizer", config = {"mode": "lookup"})
+        nlp.initialize()
+
+        return nlp, f"{language_code}+lookup", importlib.metadata.version("spacy-lookups-data")
+
+    except Exception as e:
+        logger.error(f"Error while building {mode} lemma pipeline for {model_name} - {e}")
+        raise CustomException(f"Failed to build {mode} lemma pipeline : ", e)
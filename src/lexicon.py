@@ -0,0 +1,238 @@
+import os
+import json
+import bisect
+
+import numpy as np
+
+from config.paths_config import WORD_STORE_DIR, LEXICON_DIR
+from config.config import LEXICON_BATCH_SIZE
+from src.word_store import WordStore
+from src.compact_word_list import encode_string_pool
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+from utils.run_report import RunReport
+
+logger = get_logger(__name__)
+
+
+FORMAT_VERSION = 1
+
+
+def export_lexicon(path : str, translations : dict) -> None:
+    """
+    Write a word -> translation table as a NumPy `.npz` archive.
+
+    Source words are sorted by their UTF-8 bytes and stored, like the compact
+    word list, as a string pool with offsets; translations use a second pool
+    in the same order. Lookups binary-search the source pool.
+    """
+    try:
+
+        sources = sorted(translations, key = lambda w: w.encode("utf-8"))
+        source_offsets, source_blob = encode_string_pool(sources)
+        target_offsets, target_blob = encode_string_pool([translations[w] for w in sources])
+
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            format_version = np.array(FORMAT_VERSION),
+            source_offsets = source_offsets,
+            source_blob = source_blob,
+            target_offsets = target_offsets,
+            target_blob = target_blob
+        )
+        os.replace(tmp_path, path)
+
+    except Exception as e:
+        logger.error(f"Error while exporting lexicon {path} - {e}")
+        raise CustomException("Failed to export lexicon : ", e)
+
+
+class _SourceKeys:
+    """Sequence view of the sorted source words as bytes, for `bisect`."""
+
+    def __init__(self, lexicon : "Lexicon"):
+        self.lexicon = lexicon
+
+    def __len__(self) -> int:
+        return len(self.lexicon)
+
+    def __getitem__(self, index : int) -> bytes:
+        return self.lexicon._source_bytes(index)
+
+
+class Lexicon:
+    """Read access to a table written by `export_lexicon`."""
+
+    def __init__(self, source_offsets, source_blob, target_offsets, target_blob):
+        self.source_offsets = source_offsets
+        self.source_blob = source_blob
+        self.target_offsets = target_offsets
+        self.target_blob = target_blob
+        self._keys = _SourceKeys(self)
+
+
+    def __len__(self) -> int:
+        return len(self.source_offsets) - 1
+
+
+    def _source_bytes(self, index : int) -> bytes:
+        return self.source_blob[self.source_offsets[index]:self.source_offsets[index + 1]].tobytes()
+
+
+    def _target(self, index : int) -> str:
+        return self.target_blob[self.target_offsets[index]:self.target_offsets[index + 1]].tobytes().decode("utf-8")
+
+
+    def get(self, word : str):
+        key = word.encode("utf-8")
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self) and self._source_bytes(index) == key:
+            return self._target(index)
+        return None
+
+
+    def get_many(self, words : list) -> dict:
+        """Translations of the words found in the table, as a word -> translation dictionary."""
+        found = {}
+        for word in words:
+            translation = self.get(word)
+            if translation is not None:
+                found[word] = translation
+        return found
+
+
+    def items(self) -> dict:
+        return {
+            self._source_bytes(i).decode("utf-8"): self._target(i)
+            for i in range(len(self))
+        }
+
+
+def load_lexicon(path : str) -> Lexicon:
+    try:
+
+        with np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported lexicon version {int(data['format_version'])}")
+
+            return Lexicon(
+                source_offsets = data["source_offsets"],
+                source_blob = data["source_blob"],
+                target_offsets = data["target_offsets"],
+                target_blob = data["target_blob"]
+            )
+
+    except Exception as e:
+        logger.error(f"Error while loading lexicon {path} - {e}")
+        raise CustomException("Failed to load lexicon : ", e)
+
+
+def lexicon_path(data_dir : str, source_language : str, target_language : str) -> str:
+    """
+    `<data_dir>/<source_language>/lexicon/<target>.npz`. The source folder is the
+    language's word-list folder; the target name is lowercased, like the
+    translation memory's language keys, so any spelling finds the same table.
+    """
+    return os.path.join(data_dir, source_language, LEXICON_DIR, f"{target_language.strip().lower()}.npz")
+
+
+def load_partial_translations(path : str) -> dict:
+    """Translations journalled by an interrupted `LexiconBuilder.build_pair`, one JSON batch per line."""
+    translations = {}
+    try:
+        with open(path, encoding = "utf-8") as f:
+            for line in f:
+                try:
+                    translations.update(json.loads(line))
+                except json.JSONDecodeError:
+                    # A batch cut off mid-write; its words are translated again.
+                    break
+    except FileNotFoundError:
+        pass
+
+    return translations
+
+
+class LexiconBuilder:
+    """
+    Pretranslates cleaned word lists for (source, target) language pairs.
+
+    Words are read from each source language's word store (most frequent
+    first) and sent to the translator in batches. Translations already in a
+    previous lexicon for the pair are kept, so a rebuild only translates words
+    that are new in the word list.
+
+    Each finished batch is appended to `<lexicon>.npz.partial` before the next
+    one starts. If the translator fails partway through, the next build
+    resumes from that journal instead of translating the pair from scratch;
+    the journal is removed once the lexicon is written.
+    """
+
+    def __init__(self, data_dir : str, translator, batch_size : int = LEXICON_BATCH_SIZE,
+                 report : RunReport = None):
+        self.data_dir = data_dir
+        self.translator = translator
+        self.batch_size = batch_size
+        self.report = report if report is not None else RunReport()
+
+
+    def build_pair(self, source_language : str, target_language : str) -> tuple:
+        """Build one pair's lexicon; returns its path and number of entries."""
+        path = lexicon_path(self.data_dir, source_language, target_language)
+        partial_path = f"{path}.partial"
+
+        store = WordStore.open(os.path.join(self.data_dir, source_language, WORD_STORE_DIR))
+        words = store.words(range(len(store)))
+
+        # Lexicons used to be named after the target exactly as spelled.
+        previous_path = path
+        if not os.path.exists(path):
+            previous_path = os.path.join(os.path.dirname(path), f"{target_language}.npz")
+        previous = load_lexicon(previous_path).items() if os.path.exists(previous_path) else {}
+        previous.update(load_partial_translations(partial_path))
+
+        missing = [w for w in words if w not in previous]
+        logger.info(f"Lexicon {source_language} -> {target_language}: "
+                    f"{len(words) - len(missing)} known, {len(missing)} to translate")
+
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        translated = {}
+        with open(partial_path, "a", encoding = "utf-8") as journal:
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                batch_translations = self.translator.translate_batch(batch, source_language, target_language)
+
+                journal.write(json.dumps(batch_translations, ensure_ascii = False) + "\n")
+                journal.flush()
+                translated.update(batch_translations)
+
+        # Words dropped from the word list are dropped from the lexicon too.
+        entries = {}
+        for w in words:
+            translation = translated.get(w, previous.get(w))
+            if translation:
+                entries[w] = translation
+
+        export_lexicon(path, entries)
+        os.remove(partial_path)
+        return path, len(entries)
+
+
+    def run(self, language_pairs : list) -> dict:
+        """Build every pair; returns a pair -> error message dictionary of failures."""
+        failures = {}
+
+        for source_language, target_language in language_pairs:
+            pair = f"{source_language}->{target_language}"
+            try:
+                with self.report.stage(pair, "lexicon") as timer:
+                    path, timer["words"] = self.build_pair(source_language, target_language)
+                logger.info(f"Lexicon {pair} written to {path}")
+
+            except Exception as e:
+                logger.error(f"Error while building lexicon {pair} - {e}")
+                failures[pair] = str(e)
+
+        return failures
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+class RunManifest:
+    """
+    Persistent record of the inputs each language was last processed with.
+
+    For every language the manifest stores a fingerprint: the content hash of
+    `<language>.txt`, the spaCy model name and version, the wordfreq version
+    and the difficulty bin edges. A language whose current fingerprint equals
+    the recorded one (and whose output still exists) does not need to be
+    processed again.
+    """
+
+    def __init__(self, path : str):
+        self.path = path
+        self.data = {"ingestion": {}, "languages": {}}
+
+        if os.path.exists(self.path):
+            self.load()
+
+
+    def load(self):
+        try:
+
+            with open(self.path, "r", encoding = "utf-8") as f:
+                data = json.load(f)
+
+            self.data["ingestion"] = data.get("ingestion", {})
+            self.data["languages"] = data.get("languages", {})
+
+        except Exception as e:
+            # A corrupt manifest only costs a full rebuild.
+            logger.warning(f"Ignoring unreadable run manifest {self.path} - {e}")
+            self.data = {"ingestion": {}, "languages": {}}
+
+
+    def save(self):
+        try:
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok = True)
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding = "utf-8") as f:
+                json.dump(self.data, f, indent = 2, sort_keys = True)
+            os.replace(tmp_path, self.path)
+
+        except Exception as e:
+            logger.error(f"Error while saving run manifest - {e}")
+            raise CustomException("Failed to save run manifest : ", e)
+
+
+    @staticmethod
+    def hash_file(path : str, chunk_size : int = 1 << 20) -> str:
+        digest = hashlib.sha256()
+
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+
+    def is_up_to_date(self, language : str, fingerprint : dict) -> bool:
+        entry = self.data["languages"].get(language)
+        if entry is None:
+            return False
+
+        return entry.get("fingerprint") == fingerprint
+
+
+    def record_language(self, language : str, fingerprint : dict):
+        self.data["languages"][language] = {
+            "fingerprint": fingerprint,
+            "processed_at": datetime.now().isoformat(timespec = "seconds")
+        }
+
+
+    def record_failure(self, language : str, error : str):
+        # No fingerprint, so the language is selected again on the next run.
+        self.data["languages"][language] = {
+            "error": error,
+            "failed_at": datetime.now().isoformat(timespec = "seconds")
+        }
+
+
+    def get_ingested_head(self):
+        return self.data["ingestion"].get("repo_head")
+
+
+    def record_ingestion(self, repo_head : str):
+        self.data["ingestion"] = {
+            "repo_head": repo_head,
+            "ingested_at": datetime.now().isoformat(timespec = "seconds")
+        }
@@ -0,0 +1,202 @@
+import re
+import json
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def build_translation_prompt(words : list, source_language : str, target_language : str) -> str:
+    return (
+        f"You are a precise translation engine.\n"
+        f"Translate each of the following {len(words)} words from {source_language} to {target_language}.\n"
+        f"Return ONLY valid JSON with this exact structure:\n"
+        f'{{"translations": [{{"source": "<original>", "target": "<translated>"}}, ...]}}\n'
+        f"STRICT RULES:\n"
+        f"- Use double quotes only\n"
+        f"- No markdown\n"
+        f"- No explanations\n"
+        f"- No trailing commas\n"
+        f"Words: {json.dumps(words, ensure_ascii=False)}"
+    )
+
+
+def parse_translations(text : str, words : list):
+    """
+    Parse a model response into a word -> translation dictionary holding only
+    the words the model actually translated. Returns None when the response
+    contains no usable translations list, so the caller can retry the batch.
+    """
+
+    def extract_and_fix_json(raw: str) -> dict:
+        match = re.search(r"\{.*\}", raw, re.DOTALL)
+        if not match:
+            return {}
+
+        json_text = _fix_json(match.group(0).strip())
+
+        try:
+            return json.loads(json_text)
+        except json.JSONDecodeError:
+            return {}
+
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError:
+        parsed = extract_and_fix_json(text)
+
+    translations_list = parsed.get("translations") if isinstance(parsed, dict) else None
+    if not isinstance(translations_list, list):
+        return None
+
+    model_map = {
+        item.get("source", ""): item.get("target", "")
+        for item in translations_list
+        if isinstance(item, dict)
+    }
+
+    translated = {}
+    for w in words:
+        target = model_map.get(w, model_map.get(w.capitalize()))
+        if target:
+            translated[w] = target
+
+    return translated
+
+
+def _fix_json(json_text : str) -> str:
+    # Fix common LLM JSON mistakes
+    json_text = json_text.replace("'", '"')  # single quotes -> double quotes
+    json_text = re.sub(r",\s*}", "}", json_text)  # trailing commas
+    json_text = re.sub(r",\s*]", "]", json_text)
+    return json_text
+
+
+class TranslationStreamParser:
+    """
+    Incremental parser for a streamed translation response.
+
+    `feed` takes the text as it arrives and returns the
+    `{"source": ..., "target": ...}` objects completed by that piece, so each
+    translation is usable as soon as its closing brace is generated rather
+    than when the whole response is done. Only innermost objects are
+    considered (the outer `{"translations": [...]}` wrapper is never
+    complete before the end); braces inside strings are ignored.
+    """
+
+    def __init__(self):
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+        self.text = []
+
+
+    def feed(self, piece : str) -> list:
+        completed = []
+
+        for char in piece:
+            self.text.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                # A new opening brace means the previous one was an outer object.
+                self.object_start = len(self.text) - 1
+            elif char == "}" and self.object_start is not None:
+                item = self._parse_object("".join(self.text[self.object_start:]))
+                self.object_start = None
+                if item is not None:
+                    completed.append(item)
+
+        return completed
+
+
+    @staticmethod
+    def _parse_object(json_text : str):
+        for candidate in (json_text, _fix_json(json_text)):
+            try:
+                item = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(item, dict) and "source" in item and "target" in item:
+                return {"source": str(item["source"]), "target": str(item["target"])}
+            return None
+        return None
+
+
+def match_translations(items : list, pending : set) -> list:
+    """
+    Map parsed `{"source", "target"}` items back to requested words.
+
+    `pending` holds the words still waiting for a translation; matched words
+    are removed from it. Returns `(word, translation)` pairs.
+    """
+    matched = []
+    for item in items:
+        source, target = item["source"], item["target"]
+        word = source if source in pending else next(
+            (w for w in pending if w.capitalize() == source or w.lower() == source.lower()), None
+        )
+        if word is not None and target:
+            pending.discard(word)
+            matched.append((word, target))
+    return matched
+
+
+class StubTranslator:
+    """
+    Deterministic translator for tests and offline runs: every word maps to
+    `<target language code>:<word>`. Needs no model and never fails.
+    """
+
+    name = "stub"
+
+    def translate_batch(self, words : list, source_language : str, target_language : str) -> dict:
+        code = target_language.strip().lower()[:2]
+        return {w: f"{code}:{w}" for w in words}
+
+
+class OllamaTranslator:
+    """Translates batches with a local Ollama model, retrying batches that cannot be parsed."""
+
+    name = "ollama"
+
+    def __init__(self, model : str = "llama3.2:3b", temperature : float = 0.0, max_retries : int = 2):
+        from langchain_ollama import ChatOllama
+
+        self.llm = ChatOllama(model = model, temperature = temperature)
+        self.max_retries = max_retries
+
+
+    def translate_batch(self, words : list, source_language : str, target_language : str) -> dict:
+        from langchain_core.messages import HumanMessage
+
+        prompt = build_translation_prompt(words, source_language, target_language)
+
+        for attempt in range(self.max_retries + 1):
+            response = self.llm.invoke([HumanMessage(content = prompt)])
+            result = parse_translations(getattr(response, "content", str(response)).strip(), words)
+            if result is not None:
+                return result
+            logger.warning(f"Unparsable translation of {len(words)} words (attempt {attempt + 1})")
+
+        return {}
+
+
+TRANSLATORS = {
+    StubTranslator.name: StubTranslator,
+    OllamaTranslator.name: OllamaTranslator
+}
+
+
+def get_translator(name : str, **kwargs):
+    if name not in TRANSLATORS:
+        raise ValueError(f"Unknown translator '{name}'. Available: {sorted(TRANSLATORS)}")
+    return TRANSLATORS[name](**kwargs)
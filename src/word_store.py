@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import random
+import shutil
+
+import numpy as np
+
+from src.alias_table import build_alias_table, zipf_weights, WeightedSampler
+from src.compact_word_list import CompactWordList, encode_string_pool
+from utils.logger import get_logger
+from utils.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+FORMAT_VERSION = 3
+CURRENT_FILE = "CURRENT"
+ARRAYS = ("offsets", "blob", "difficulty", "zipf",
+          "alias_prob", "alias_index", "level_alias_prob", "level_alias_index")
+
+
+def build_word_store(store_dir : str,
+                     words : list,
+                     difficulty_codes,
+                     zipf_frequencies,
+                     difficulty_labels : list) -> str:
+    """
+    Write a read-only, memory-mappable word store for one language.
+
+    Words are sorted by Zipf frequency (most frequent first), which makes every
+    difficulty level a contiguous index range. The store is made of `.npy`
+    arrays in the `CompactWordList` layout (`offsets` into a UTF-8 `blob`,
+    uint8 `difficulty` codes and float32 `zipf`) plus `meta.json`. Alias
+    tables for frequency-weighted sampling are precomputed for the whole list
+    (`alias_prob`/`alias_index`) and for each difficulty level
+    (`level_alias_*`, one table per level's index range, with indices relative
+    to the level start). Each build goes into its own sub-directory and the
+    `CURRENT` file is swapped atomically at the end, so processes reading an
+    older build are never disturbed.
+
+    :return: The directory of the new build.
+    """
+    try:
+
+        zipf = np.asarray(zipf_frequencies, dtype = np.float32)
+        codes = np.asarray(difficulty_codes, dtype = np.uint8)
+        order = np.argsort(-zipf, kind = "stable")
+
+        offsets, blob = encode_string_pool([words[i] for i in order])
+
+        codes = codes[order]
+        ranges = {}
+        for code, label in enumerate(difficulty_labels):
+            positions = np.flatnonzero(codes == code)
+            # Difficulty is a monotone function of zipf, so each level is contiguous.
+            ranges[label] = [int(positions[0]), int(positions[-1]) + 1] if len(positions) else [0, 0]
+
+        zipf = zipf[order]
+        alias_prob, alias_index = build_alias_table(zipf_weights(zipf))
+        level_alias_prob = np.ones(len(zipf), dtype = np.float64)
+        level_alias_index = np.zeros(len(zipf), dtype = np.int32)
+        for start, end in ranges.values():
+            if end > start:
+                level_alias_prob[start:end], level_alias_index[start:end] = build_alias_table(
+                    zipf_weights(zipf[start:end])
+                )
+
+        build_id = f"{time.time_ns()}-{os.getpid()}"
+        build_dir = os.path.join(store_dir, build_id)
+        os.makedirs(build_dir)
+
+        np.save(os.path.join(build_dir, "offsets.npy"), offsets)
+        np.save(os.path.join(build_dir, "blob.npy"), blob)
+        np.save(os.path.join(build_dir, "difficulty.npy"), codes)
+        np.save(os.path.join(build_dir, "zipf.npy"), zipf)
+        np.save(os.path.join(build_dir, "alias_prob.npy"), alias_prob)
+        np.save(os.path.join(build_dir, "alias_index.npy"), alias_index)
+        np.save(os.path.join(build_dir, "level_alias_prob.npy"), level_alias_prob)
+        np.save(os.path.join(build_dir, "level_alias_index.npy"), level_alias_index)
+
+        with open(os.path.join(build_dir, "meta.json"), "w", encoding = "utf-8") as f:
+            json.dump({
+                "format_version": FORMAT_VERSION,
+                "count": len(offsets) - 1,
+                "labels": list(difficulty_labels),
+                "difficulty_ranges": ranges
+            }, f)
+
+        tmp_current = os.path.join(store_dir, f"{CURRENT_FILE}.tmp")
+        with open(tmp_current, "w", encoding = "utf-8") as f:
+            f.write(build_id)
+        os.replace(tmp_current, os.path.join(store_dir, CURRENT_FILE))
+
+        # Keep the previous build for readers that have just read CURRENT; older
+        # ones can go, since processes that mapped them keep their pages.
+        builds = sorted(
+            (name for name in os.listdir(store_dir) if os.path.isdir(os.path.join(store_dir, name))),
+            key = lambda name: int(name.split("-")[0])
+        )
+        for name in builds[:-2]:
+            shutil.rmtree(os.path.join(store_dir, name), ignore_errors = True)
+
+        return build_dir
+
+    except Exception as e:
+        logger.error(f"Error while building word store in {store_dir} - {e}")
+        raise CustomException("Failed to build word store : ", e)
+
+
+class WordStore(CompactWordList):
+    """
+    Zero-copy view of a word store built by `build_word_store`.
+
+    All arrays are opened with `mmap_mode="r"`, so every process that opens
+    the same store shares one copy in the page cache and opening it parses
+    nothing but a small `meta.json`. Sampling draws indices and decodes only
+    the selected words; frequency-weighted sampling reads the precomputed
+    alias tables straight from the mapped arrays.
+    """
+
+    def __init__(self, build_dir : str):
+        with open(os.path.join(build_dir, "meta.json"), encoding = "utf-8") as f:
+            meta = json.load(f)
+
+        if meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported word store version {meta['format_version']}")
+
+        arrays = {name: np.load(os.path.join(build_dir, f"{name}.npy"), mmap_mode = "r") for name in ARRAYS}
+        super().__init__(arrays["offsets"], arrays["blob"], arrays["difficulty"], arrays["zipf"], meta["labels"])
+
+        self.build_dir = build_dir
+        self.difficulty_ranges = {label: tuple(r) for label, r in meta["difficulty_ranges"].items()}
+        self.alias_prob, self.alias_index = arrays["alias_prob"], arrays["alias_index"]
+        self.level_alias_prob, self.level_alias_index = arrays["level_alias_prob"], arrays["level_alias_index"]
+
+        tables = {(0, len(self)): (self.alias_prob, self.alias_index)}
+        for start, end in self.difficulty_ranges.values():
+            if end > start:
+                tables[(start, end)] = (self.level_alias_prob[start:end], self.level_alias_index[start:end])
+        self.weighted_sampler = WeightedSampler(self.zipf, tables)
+
+
+    @staticmethod
+    def current_build(store_dir : str) -> str:
+        """Directory of the build `CURRENT` points to."""
+        with open(os.path.join(store_dir, CURRENT_FILE), encoding = "utf-8") as f:
+            return os.path.join(store_dir, f.read().strip())
+
+
+    @classmethod
+    def open(cls, store_dir : str) -> "WordStore":
+        try:
+            return cls(cls.current_build(store_dir))
+
+        except Exception as e:
+            logger.error(f"Error while opening word store {store_dir} - {e}")
+            raise CustomException("Failed to open word store : ", e)
+
+
+    def index_range(self, difficulty_level : str = None) -> tuple:
+        if difficulty_level is None:
+            return 0, len(self)
+        return self.difficulty_ranges.get(difficulty_level, (0, 0))
+
+
+    def sample(self, n : int, difficulty_level : str = None) -> list:
+        start, end = self.index_range(difficulty_level)
+        return self.words(random.sample(range(start, end), n))
+
+
+    def weighted_indices(self, n : int, min_zipf : float = None, max_zipf : float = None) -> list:
+        """Indices of `n` distinct words weighted by `zipf_weights`, optionally within a Zipf range."""
+        start, end = self.weighted_sampler.zipf_range(min_zipf, max_zipf)
+        return self.weighted_sampler.sample(n, start, end)
+
+
+    def weighted_sample(self, n : int, min_zipf : float = None, max_zipf : float = None) -> list:
+        return self.words(self.weighted_indices(n, min_zipf, max_zipf))
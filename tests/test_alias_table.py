@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.alias_table import build_alias_table, zipf_weights, WeightedSampler
+
+
+def implied_distribution(prob, alias) -> np.ndarray:
+    """Probability of each index under the table: its own column's `prob / n` plus the alias mass sent to it."""
+    n = len(prob)
+    distribution = prob / n
+    np.add.at(distribution, alias, (1.0 - prob) / n)
+    return distribution
+
+
+rng = np.random.default_rng(0)
+
+WEIGHTS = {
+    "random": rng.random(1000),
+    "skewed": rng.random(50) ** 8,
+    "one dominant": np.array([1000.0] + [1.0] * 999),
+    "heavy tail": rng.pareto(1.0, 5000),
+    # Equal weights that scale to 0.999..., so no column counts as large.
+    "equal, 0.1 x 3": np.full(3, 0.1),
+    "equal, 0.3 x 7": np.full(7, 0.3),
+    "ones": np.ones(10),
+    "some zeros": np.array([0.0, 0.0, 3.0, 0.0, 1.0]),
+    "single": np.array([5.0]),
+    "zipf": zipf_weights(np.sort(rng.uniform(1.0, 7.7, 20000))[::-1]),
+}
+
+
+@pytest.mark.parametrize("weights", WEIGHTS.values(), ids = WEIGHTS.keys())
+def test_alias_table_matches_weights(weights):
+    prob, alias = build_alias_table(weights)
+
+    assert prob.shape == alias.shape == weights.shape
+    assert alias.dtype == np.int32
+    assert np.all((prob >= 0.0) & (prob <= 1.0))
+    assert np.all((alias >= 0) & (alias < len(weights)))
+    np.testing.assert_allclose(implied_distribution(prob, alias), weights / weights.sum(), atol = 1e-12)
+
+
+def test_alias_table_random_weight_vectors():
+    generator = np.random.default_rng(1)
+    for _ in range(2000):
+        weights = generator.random(generator.integers(1, 20))
+        if generator.random() < 0.3:
+            weights[:] = weights[0]
+        prob, alias = build_alias_table(weights)
+        np.testing.assert_allclose(implied_distribution(prob, alias), weights / weights.sum(), atol = 1e-12)
+
+
+@pytest.mark.parametrize("weights", [np.zeros(4), np.array([])], ids = ["all zero", "empty"])
+def test_alias_table_without_weight_is_uniform(weights):
+    prob, alias = build_alias_table(weights)
+
+    assert np.all(prob == 1.0)
+    assert np.array_equal(alias, np.arange(len(weights)))
+
+
+def test_zipf_weights_are_tempered():
+    weights = zipf_weights([7.0, 6.0, 3.0])
+
+    assert weights[0] == 1.0
+    np.testing.assert_allclose(weights[1:], [10 ** -0.5, 10 ** -2.0])
+
+
+def test_weighted_sampler_draws_distinct_indices_in_range():
+    zipf = np.sort(np.random.default_rng(2).uniform(1.0, 7.0, 500))[::-1].astype(np.float32)
+    sampler = WeightedSampler(zipf, {})
+
+    start, end = sampler.zipf_range(3.0, 5.0)
+    drawn = sampler.sample(50, start, end, rng = np.random.default_rng(3))
+
+    assert len(set(drawn)) == 50
+    assert all(3.0 - 1e-4 <= zipf[i] <= 5.0 + 1e-4 for i in drawn)
@@ -0,0 +1,92 @@
+"""
+DataIngestion against a local bare repository, in both the default (full
+clone + pull) and the incremental (sparse, shallow) mode. The setup mirrors
+benchmarks/data_processing.py:bench_ingestion.
+"""
+import os
+import json
+import subprocess
+
+import pytest
+
+from src.data_ingestion import DataIngestion
+from src.run_manifest import RunManifest
+
+LANGUAGES = ["Alpha", "Beta", "Gamma"]
+
+
+def git(repo : str, *args) -> str:
+    result = subprocess.run(
+        ["git", "-C", repo, "-c", "user.name=test", "-c", "user.email=test@localhost", *args],
+        check = True, capture_output = True, text = True
+    )
+    return result.stdout.strip()
+
+
+def write_word_list(path : str, words : list):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "w", encoding = "utf-8") as f:
+        f.write("\n".join(words) + "\n")
+
+
+def read(path : str) -> str:
+    with open(path, encoding = "utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """A bare repo with one word list per language, and a working clone that pushes to it."""
+    bare = str(tmp_path / "upstream.git")
+    work = str(tmp_path / "work")
+    subprocess.run(["git", "init", "-q", "--bare", bare], check = True)
+    subprocess.run(["git", "clone", "-q", bare, work], check = True, capture_output = True)
+
+    for language in LANGUAGES:
+        write_word_list(os.path.join(work, language, f"{language}.txt"), [f"{language.lower()}-{i}" for i in range(5)])
+    git(work, "add", "-A")
+    git(work, "commit", "-q", "-m", "initial")
+    git(work, "push", "-q", "origin", "HEAD")
+
+    return f"file://{bare}", work
+
+
+@pytest.mark.parametrize("incremental", [False, True], ids = ["full", "incremental"])
+def test_ingestion_syncs_changes_and_keeps_cleaned_outputs(tmp_path, upstream, incremental):
+    url, work = upstream
+    repo_dir = str(tmp_path / "repo")
+    output_dir = str(tmp_path / "out")
+    manifest_path = str(tmp_path / "run-manifest.json")
+
+    def ingest():
+        manifest = RunManifest(manifest_path)
+        DataIngestion(url, repo_dir, output_dir, manifest = manifest,
+                      incremental = incremental, languages = LANGUAGES).run()
+        return RunManifest(manifest_path)
+
+    manifest = ingest()
+    for language in LANGUAGES:
+        assert read(os.path.join(output_dir, language, f"{language}.txt")).startswith(f"{language.lower()}-0")
+    assert manifest.get_ingested_head() == git(work, "rev-parse", "HEAD")
+
+    # What the processing stage writes next to the raw word lists.
+    cleaned_path = os.path.join(output_dir, "Gamma", "word-list-cleaned.json")
+    with open(cleaned_path, "w", encoding = "utf-8") as f:
+        json.dump([{"word": "gamma-0"}], f)
+
+    # Upstream changes one word list and deletes another.
+    write_word_list(os.path.join(work, "Alpha", "Alpha.txt"), ["changed"])
+    git(work, "rm", "-q", os.path.join("Beta", "Beta.txt"))
+    git(work, "commit", "-q", "-am", "update")
+    git(work, "push", "-q", "origin", "HEAD")
+
+    manifest = ingest()
+    assert read(os.path.join(output_dir, "Alpha", "Alpha.txt")) == "changed\n"
+    assert not os.path.exists(os.path.join(output_dir, "Beta", "Beta.txt"))
+    assert read(os.path.join(output_dir, "Gamma", "Gamma.txt")).startswith("gamma-0")
+    assert json.loads(read(cleaned_path)) == [{"word": "gamma-0"}]
+    assert manifest.get_ingested_head() == git(work, "rev-parse", "HEAD")
+
+    # Nothing changed upstream: the cleaned output is still left alone.
+    ingest()
+    assert os.path.exists(cleaned_path)
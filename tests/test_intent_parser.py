@@ -0,0 +1,51 @@
+import pytest
+
+from agent.intent_parser import parse_intent, MAX_WORDS
+
+
+ACCEPTED = [
+    ("Get 10 random words in Spanish", ("Spanish", 10, None, None)),
+    ("Give me 20 easy words in French", ("French", 20, "beginner", None)),
+    ("get fifteen hard German words", ("German", 15, "advanced", None)),
+    ("Please show me 5 intermediate level Italian words", ("Italian", 5, "intermediate", None)),
+    ("Translate 10 Spanish words into English", ("Spanish", 10, None, "English")),
+    ("Get 10 advanced German words and translate them to English", ("German", 10, "advanced", "English")),
+    ("translate twelve basic words from Polish to Dutch", ("Polish", 12, "beginner", "Dutch")),
+    (f"Get {MAX_WORDS} words in Swedish", ("Swedish", MAX_WORDS, None, None)),
+]
+
+FALL_THROUGH = {
+    "deck": "Create a deck with 10 Spanish words",
+    "anki": "Get 10 Spanish words and make Anki cards",
+    "mcp tool": "Use anki::create_deck for 10 Spanish words",
+    "two numbers": "Get 10 or 20 Spanish words",
+    "two number words": "Get twenty five Spanish words",
+    "no number": "Get some Spanish words",
+    "zero": "Get 0 Spanish words",
+    "above MAX_WORDS": f"Get {MAX_WORDS + 1} Spanish words",
+    "two difficulties": "Get 10 easy and hard Spanish words",
+    "two source languages": "Get 10 Spanish and French words",
+    "several targets": "Translate 10 Spanish words into English and German",
+    "same source and target": "Get 10 English words and translate them to English",
+    "target before source": "Translate 10 words into Spanish from Spanish",
+    "unknown target": "Translate 10 Spanish words into Klingon",
+    "no language": "Get 10 easy words",
+    "topic": "Get 10 Spanish words about food",
+    "letter": "Get 10 Spanish words starting with b",
+    "part of speech": "Get 10 Spanish verbs",
+    "not a word request": "How do you say hello in Spanish",
+}
+
+
+@pytest.mark.parametrize("prompt, expected", ACCEPTED, ids = [p for p, _ in ACCEPTED])
+def test_parse_intent_accepts(prompt, expected):
+    intent = parse_intent(prompt)
+
+    assert intent is not None
+    assert (intent["source_language"], intent["number_of_words"],
+            intent["word_difficulty"], intent["target_language"]) == expected
+
+
+@pytest.mark.parametrize("prompt", FALL_THROUGH.values(), ids = FALL_THROUGH.keys())
+def test_parse_intent_falls_through_to_the_llm(prompt):
+    assert parse_intent(prompt) is None
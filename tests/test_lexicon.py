@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pytest
+
+import agent.tools as tools
+from agent.lexicon_index import LexiconIndex
+from agent.translation_memory import TranslationMemory
+from src.lexicon import LexiconBuilder, export_lexicon, lexicon_path, load_lexicon
+from src.translators import StubTranslator
+from src.word_store import build_word_store
+from config.paths_config import WORD_STORE_DIR
+
+WORDS = [f"palabra{i}" for i in range(23)]
+
+
+class RecordingTranslator(StubTranslator):
+    """StubTranslator that remembers what it was asked and can fail on a given batch."""
+
+    def __init__(self, fail_on_batch : int = None):
+        self.batches = []
+        self.fail_on_batch = fail_on_batch
+
+    def translate_batch(self, words, source_language, target_language):
+        if len(self.batches) + 1 == self.fail_on_batch:
+            raise RuntimeError("translator went away")
+        self.batches.append(list(words))
+        return super().translate_batch(words, source_language, target_language)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    zipf = np.linspace(6.0, 2.0, len(WORDS))
+    build_word_store(os.path.join(tmp_path, "Spanish", WORD_STORE_DIR), WORDS,
+                     np.zeros(len(WORDS), dtype = np.uint8), zipf, ["beginner"])
+    return str(tmp_path)
+
+
+def test_build_pair_translates_every_word(data_dir):
+    translator = RecordingTranslator()
+    path, count = LexiconBuilder(data_dir, translator, batch_size = 5).build_pair("Spanish", "English")
+
+    assert count == len(WORDS)
+    assert [len(batch) for batch in translator.batches] == [5, 5, 5, 5, 3]
+    assert load_lexicon(path).items() == {w: f"en:{w}" for w in WORDS}
+    assert not os.path.exists(f"{path}.partial")
+
+
+def test_build_pair_resumes_from_partial_journal(data_dir):
+    failing = RecordingTranslator(fail_on_batch = 3)
+    with pytest.raises(RuntimeError):
+        LexiconBuilder(data_dir, failing, batch_size = 5).build_pair("Spanish", "English")
+
+    path = lexicon_path(data_dir, "Spanish", "English")
+    assert not os.path.exists(path)
+    assert os.path.exists(f"{path}.partial")
+
+    translator = RecordingTranslator()
+    _, count = LexiconBuilder(data_dir, translator, batch_size = 5).build_pair("Spanish", "English")
+
+    already_translated = {w for batch in failing.batches for w in batch}
+    assert len(already_translated) == 10
+    assert sum(len(batch) for batch in translator.batches) == len(WORDS) - 10
+    assert not already_translated & {w for batch in translator.batches for w in batch}
+    assert count == len(WORDS)
+    assert not os.path.exists(f"{path}.partial")
+
+
+def test_lexicon_target_is_lowercased(data_dir):
+    path, _ = LexiconBuilder(data_dir, StubTranslator()).build_pair("Spanish", "English")
+
+    assert path == os.path.join(data_dir, "Spanish", "lexicon", "english.npz")
+    assert lexicon_path(data_dir, "Spanish", " ENGLISH ") == path
+    assert LexiconIndex(data_dir).get_many("Spanish", "english", ["palabra1", "missing"]) == {"palabra1": "en:palabra1"}
+
+
+@pytest.fixture
+def translation_sources(tmp_path, monkeypatch):
+    """Point the tools at a temporary lexicon and translation memory, and record model calls."""
+    export_lexicon(lexicon_path(str(tmp_path), "Spanish", "English"), {"uno": "one (lexicon)"})
+    memory = TranslationMemory(os.path.join(tmp_path, "memory.sqlite"))
+    memory.put_many("spanish", "english", {"uno": "one (memory)", "dos": "two (memory)"})
+
+    model_calls = []
+
+    def stub_model(words, source_language, target_language):
+        model_calls.append(list(words))
+        return StubTranslator().translate_batch(words, source_language, target_language)
+
+    monkeypatch.setattr(tools, "lexicon_index", LexiconIndex(str(tmp_path)))
+    monkeypatch.setattr(tools, "translation_memory", memory)
+    monkeypatch.setattr(tools, "_translate_with_model", stub_model)
+    return memory, model_calls
+
+
+def test_known_translations_prefer_lexicon_over_memory(translation_sources):
+    known = tools._known_translations(["uno", "dos", "tres"], "Spanish", "English")
+
+    assert known == {"uno": "one (lexicon)", "dos": "two (memory)"}
+
+
+def test_only_missing_words_reach_the_model(translation_sources):
+    memory, model_calls = translation_sources
+
+    result = tools._translate_words(["uno", "dos", "tres", "tres", "cuatro"], "Spanish", "English")
+
+    assert model_calls == [["tres", "cuatro"]]
+    assert [t["target"] for t in result["translations"]] == [
+        "one (lexicon)", "two (memory)", "en:tres", "en:tres", "en:cuatro"
+    ]
+    # Model output is remembered, so the next request needs no model call.
+    assert memory.get_many("Spanish", "English", ["tres", "cuatro"]) == {"tres": "en:tres", "cuatro": "en:cuatro"}
+    tools._translate_words(["tres", "cuatro"], "Spanish", "English")
+    assert len(model_calls) == 1
@@ -0,0 +1,216 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # only needed where /proc is not available
+    psutil = None
+
+
+def current_rss_bytes():
+    """Current resident set size of this process in bytes, if available."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+def peak_rss_bytes():
+    """The kernel's peak RSS mark for this process (`VmHWM`) in bytes, if available."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset `VmHWM` to the current RSS (Linux >= 4.0); False where that is not possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def to_mb(n_bytes):
+    return round(n_bytes / (1024 * 1024), 1) if n_bytes is not None else None
+
+
+class RssSampler:
+    """Highest RSS seen by a background thread polling `current_rss_bytes`."""
+
+    def __init__(self, interval : float = 0.01):
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target = self._run, daemon = True)
+
+
+    def _sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+
+    def start(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self._sample()
+        return self.peak
+
+
+# Peaks of the blocks currently measured by `track_peak_rss` in this process, outermost first.
+_open_peaks = []
+
+
+def _fold_peak(peak):
+    if peak is not None:
+        for result in _open_peaks:
+            result["peak"] = peak if result["peak"] is None else max(result["peak"], peak)
+
+
+@contextmanager
+def track_peak_rss():
+    """
+    Measure the peak RSS of a block. The yielded dict's "peak" holds it in
+    bytes once the block ends (None if it cannot be measured).
+
+    Where the kernel supports it, `VmHWM` is reset when the block starts and
+    read when it ends, so the peak covers the block alone. Enclosing blocks
+    take in the mark before it is reset, so blocks can be nested. Elsewhere a
+    background thread samples the RSS, which may miss very short spikes.
+    """
+    result = {"peak": None}
+
+    _fold_peak(peak_rss_bytes())
+    sampler = None if reset_peak_rss() and peak_rss_bytes() is not None else RssSampler().start()
+    _open_peaks.append(result)
+
+    try:
+        yield result
+    finally:
+        _fold_peak(sampler.stop() if sampler is not None else peak_rss_bytes())
+        _open_peaks.remove(result)
+
+
+class RunReport:
+    """
+    Collects per-language, per-stage timings for a pipeline run.
+
+    Every record holds the stage's wall time, the number of words it handled,
+    the resulting words/sec, the peak RSS reached during the stage (see
+    `track_peak_rss`) and the RSS left when it ended.
+    Records are plain dictionaries so worker processes can send them back.
+    Languages that failed are listed separately in `failures`.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.records = []
+        self.failures = []
+
+
+    def add(self, language : str, stage : str, seconds : float, words : int = None,
+            peak_rss : int = None) -> dict:
+        record = {
+            "language": language,
+            "stage": stage,
+            "seconds": round(seconds, 4),
+            "words": words,
+            "words_per_sec": round(words / seconds, 1) if words and seconds > 0 else None,
+            "peak_rss_mb": to_mb(peak_rss),
+            "rss_mb": to_mb(current_rss_bytes()),
+            "pid": os.getpid()
+        }
+        self.records.append(record)
+        return record
+
+
+    @contextmanager
+    def stage(self, language : str, stage : str, words : int = None):
+        """
+        Time a block. The yielded dict can be updated inside the block, e.g.
+        `timer["words"] = len(df)` once the word count is known.
+        """
+        timer = {"words": words}
+        start = time.perf_counter()
+
+        try:
+            with track_peak_rss() as rss:
+                yield timer
+        finally:
+            self.add(language, stage, time.perf_counter() - start, timer["words"], rss["peak"])
+
+
+    def add_failure(self, language : str, stage : str, error : str) -> dict:
+        failure = {"language": language, "stage": stage, "error": error}
+        self.failures.append(failure)
+        return failure
+
+
+    def extend(self, records : list):
+        self.records.extend(records)
+
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(timespec = "seconds"),
+            "finished_at": datetime.now().isoformat(timespec = "seconds"),
+            "records": self.records,
+            "failures": self.failures
+        }
+
+
+    def write(self, directory : str) -> str:
+        os.makedirs(directory, exist_ok = True)
+        path = os.path.join(directory, f"run-{self.started_at.strftime('%Y-%m-%d_%H-%M-%S')}.json")
+
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump(self.to_dict(), f, indent = 2)
+
+        return path
+
+
+    def summary_table(self) -> str:
+        header = (f"{'language':<12} {'stage':<11} {'seconds':>9} {'words':>9} {'words/s':>11} "
+                  f"{'peak MB':>9} {'end MB':>9}")
+        lines = [header, "-" * len(header)]
+
+        for r in self.records:
+            lines.append(
+                f"{r['language']:<12} {r['stage']:<11} {r['seconds']:>9.2f} "
+                f"{r['words'] if r['words'] is not None else '-':>9} "
+                f"{r['words_per_sec'] if r['words_per_sec'] is not None else '-':>11} "
+                f"{r['peak_rss_mb'] if r['peak_rss_mb'] is not None else '-':>9} "
+                f"{r['rss_mb'] if r['rss_mb'] is not None else '-':>9}"
+            )
+
+        for f in self.failures:
+            lines.append(f"{f['language']:<12} {f['stage']:<11} FAILED: {f['error']}")
+
+        return "\n".join(lines)